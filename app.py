@@ -1,132 +1,283 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import marshal
+import math
+import mimetypes
+import multiprocessing
 import os
-from flask import Flask, render_template_string, request, redirect, url_for, session
+import queue
+import re
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from types import MappingProxyType
+
+import click
+from flask import (
+    Flask, Response, abort, g, has_app_context, has_request_context, request, redirect, url_for, session,
+    stream_with_context,
+)
+from markupsafe import escape
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch scoring
+    np = None
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip
+    brotli = None
+
+try:
+    import yaml
+except ImportError:  # PyYAML is only needed for YAML catalog files
+    yaml = None
 
 # Initialize the Flask application
 app = Flask(__name__)
 # A secret key is required for sessions (to store answers between pages)
 # In a real app, set this as an environment variable
 app.secret_key = os.urandom(24)
+# Check incremental report tallies against a full recompute on every report
+app.config["VERIFY_TALLIES"] = os.environ.get("VERIFY_TALLIES") == "1"
+# Stream the report page in chunks instead of rendering it in one piece
+app.config["STREAM_REPORTS"] = os.environ.get("STREAM_REPORTS") == "1"
+# Question catalog file (JSON or YAML) and how often to check it for changes
+app.config["CATALOG_PATH"] = os.environ.get(
+    "CATALOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+)
+app.config["CATALOG_RELOAD_INTERVAL"] = float(os.environ.get("CATALOG_RELOAD_INTERVAL", 2))
+# Number of rendered pages to keep, keyed by their ETag
+app.config["RENDER_CACHE_SIZE"] = int(os.environ.get("RENDER_CACHE_SIZE", 256))
+# Responses smaller than this many bytes are not compressed
+app.config["COMPRESS_MIN_SIZE"] = 500
+# Token for the portfolio-wide views (/export, /dashboard) and the batch API; they are off if unset
+app.config["EXPORT_TOKEN"] = os.environ.get("EXPORT_TOKEN")
+# Batch API: worker processes, assessments per unit of work, how many units
+# may be queued across all requests, concurrent batches and items per batch
+app.config["BATCH_PROCESSES"] = int(
+    os.environ.get("BATCH_PROCESSES", max(1, (os.cpu_count() or 2) // 2))
+)
+app.config["BATCH_CHUNK_SIZE"] = 200
+app.config["BATCH_MAX_PENDING"] = int(os.environ.get("BATCH_MAX_PENDING", 8))
+app.config["BATCH_MAX_CONCURRENT"] = int(os.environ.get("BATCH_MAX_CONCURRENT", 2))
+app.config["BATCH_MAX_ITEMS"] = int(os.environ.get("BATCH_MAX_ITEMS", 10000))
+# Dump a sampled profile of any request slower than this many milliseconds
+app.config["PROFILE_THRESHOLD_MS"] = float(os.environ.get("PROFILE_THRESHOLD_MS", 0)) or None
+app.config["PROFILE_DIR"] = os.environ.get("PROFILE_DIR", "profiles")
 
-# --- MOCK DATA ---
-# This is a simplified, mock representation of ISO/IEC 42001 requirements
-# In a real project, this would be loaded from a database.
-ISO_42001_SECTIONS = [
-    {
-        "title": "Section 1: Context & Leadership (Clauses 4 & 5)",
-        "description": "Understanding the organization's context and the role of top management in the AI Management System (AIMS).",
-        "questions": [
-            {
-                "id": "C4_1",
-                "text": "Has the organization determined external and internal issues relevant to its purpose and that affect its ability to achieve the intended outcomes of its AIMS?",
-                "recommendation": "Conduct a formal 'Context of the Organization' analysis (e.g., PESTLE, SWOT) specifically for your AI systems. Identify all internal/external stakeholders (regulators, customers, data subjects) and their expectations."
-            },
-            {
-                "id": "C5_1",
-                "text": "Does top management demonstrate leadership and commitment with respect to the AIMS (e.g., establishing an AI policy, ensuring integration of AIMS into business processes)?",
-                "recommendation": "Develop and formally approve a high-level AI Policy. Assign clear roles and responsibilities for AI governance, and ensure leadership regularly reviews the AIMS performance."
-            },
-            {
-                "id": "C5_2",
-                "text": "Has an AI policy been established, documented, and communicated within the organization and to relevant stakeholders?",
-                "recommendation": "Ensure the AI policy is easily accessible (e.g., on the intranet) and that all relevant personnel (developers, procurement, legal) have received training on it."
-            }
-        ]
-    },
-    {
-        "title": "Section 2: Planning & Risk Management (Clause 6)",
-        "description": "Addressing actions to manage risks and opportunities related to the AIMS.",
-        "questions": [
-            {
-                "id": "C6_1",
-                "text": "Has the organization established a formal AI risk assessment process, including criteria for risk acceptance?",
-                "recommendation": "Adopt a risk management framework (like ISO 31000 or NIST AI RMF). Define clear criteria for assessing AI-specific risks (e.g., bias, privacy, security, fairness) and establish a risk register."
-            },
-            {
-                "id": "C6_2",
-                "text": "Are AI risk treatment plans developed and implemented to address unacceptable risks?",
-                "recommendation": "For each high-risk item, document a treatment plan (Avoid, Mitigate, Transfer, Accept). This plan should link to specific controls from Annex A or other sources."
-            },
-            {
-                "id": "C6_3",
-                "text": "Are AI system impact assessments (AIIA) conducted for AI systems, considering their potential consequences?",
-                "recommendation": "Develop a standardized AIIA template. This should be a mandatory step in the AI system lifecycle, especially before deploying new systems or making major updates to existing ones."
-            }
-        ]
-    },
-    {
-        "title": "Section 3: Support & Resources (Clause 7)",
-        "description": "Ensuring the AIMS is supported with adequate resources, competence, awareness, and documentation.",
-        "questions": [
-            {
-                "id": "C7_1",
-                "text": "Does the organization provide necessary resources (human, technical, financial) for the AIMS?",
-                "recommendation": "Budget for AIMS-specific roles (e.g., AI Governance Officer, AI auditors), necessary tools (e.g., model monitoring, data validation), and training programs."
-            },
-            {
-                "id": "C7_2",
-                "text": "Are personnel involved in the AIMS competent on the basis of appropriate education, training, or experience?",
-                "recommendation": "Create a training matrix for AI-related roles. Training should cover responsible AI principles, cybersecurity best practices for AI, data privacy, and the organization's specific AI policies."
-            },
-            {
-                "id": "C7_3",
-                "text": "Is documented information required by the AIMS and this standard controlled (e.g., created, updated, available, and protected)?",
-                "recommendation": "Establish a document control procedure. Use a central repository (e.g., SharePoint, Confluence) for all AIMS documentation (policies, risk assessments, audit reports) with version control and access restrictions."
-            }
-        ]
-    },
-    {
-        "title": "Section 4: AI System Lifecycle (Clause 8)",
-        "description": "Managing the planning, design, development, verification, validation, and operation of AI systems.",
-        "questions": [
-            {
-                "id": "C8_1",
-                "text": "Are processes in place to manage the entire AI system lifecycle, from conception to decommissioning?",
-                "recommendation": "Define and document a formal AI System Development Lifecycle (SDLC). This should integrate AIMS requirements (e.g., AIIAs, V&V, data governance) at each stage."
-            },
-            {
-                "id": "C8_2",
-                "text": "Is data for AI system development and operation managed according to quality, security, and privacy requirements?",
-                "recommendation": "Implement robust data governance practices. This includes data lineage documentation, quality checks, data minimization, and applying security controls (e.g., encryption, access control) to training and operational data."
-            },
-            {
-                "id": "C8_3",
-                "text": "Are verification and validation (V&V) activities performed to ensure the AI system meets its intended requirements?",
-                "recommendation": "Develop V&V plans that test for more than just accuracy. Include tests for robustness, fairness/bias, and security vulnerabilities (e.g., model evasion, data poisoning)."
-            },
-            {
-                "id": "C8_4",
-                "text": "Are processes established for the responsible deployment, operation, and monitoring of AI systems in production?",
-                "recommendation": "Implement continuous monitoring for AI systems. This should track model performance, data drift, and potential emergence of bias. Establish a clear human-in-the-loop (HITL) process for critical decisions."
-            }
-        ]
-    },
-    {
-        "title": "Section 5: Evaluation & Improvement (Clauses 9 & 10)",
-        "description": "Monitoring, measuring, analyzing, and improving the AI Management System.",
-        "questions": [
-            {
-                "id": "C9_1",
-                "text": "Is the performance and effectiveness of the AIMS monitored, measured, analyzed, and evaluated?",
-                "recommendation": "Define key performance indicators (KPIs) for your AIMS. Examples: % of AI systems that completed an AIIA, # of AI-related incidents, % of staff trained on AI policy."
-            },
-            {
-                "id": "C9_2",
-                "text": "Are internal audits of the AIMS conducted at planned intervals?",
-                "recommendation": "Schedule and conduct internal AIMS audits. These should be performed by competent auditors (internal or external) who are independent of the AI system's development."
-            },
-            {
-                "id": "C9_3",
-                "text": "Does top management review the AIMS at planned intervals (Management Review)?",
-                "recommendation": "Establish a formal Management Review meeting (e.g., annually). This meeting must review AIMS performance, audit results, and opportunities for improvement, with documented minutes and actions."
-            },
-            {
-                "id": "C9_4",
-                "text": "Does the organization continually improve the suitability, adequacy, and effectiveness of the AIMS, including addressing non-conformities?",
-                "recommendation": "Implement a formal corrective action process (CAPA). When non-conformities are found (from audits or incidents), they must be logged, a root cause analysis performed, and corrective actions tracked to completion."
-            }
-        ]
-    }
-]
+# --- QUESTION CATALOG ---
+# The nested section data (ISO_42001_SECTIONS, loaded from the catalog file)
+# is compiled once into flat, indexed records so scoring, rendering and
+# validation never walk the raw dicts.
+
+# Answer statuses, in ascending order of maturity. A question's position in
+# this tuple is its status code.
+STATUSES = ("not_implemented", "partially_implemented", "fully_implemented")
+DEFAULT_STATUS = "not_implemented"
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+FULLY_IMPLEMENTED = STATUS_CODES["fully_implemented"]
+
+
+class Question:
+    """A single assessment question at a fixed position in the catalog."""
+
+    __slots__ = ("index", "id", "text", "recommendation", "section_index")
+
+    def __init__(self, index, id, text, recommendation, section_index):
+        self.index = index
+        self.id = id
+        self.text = text
+        self.recommendation = recommendation
+        self.section_index = section_index
+
+    def __repr__(self):
+        return f"<Question {self.id}>"
+
+
+class Section:
+    """A page of the assessment, covering questions[start:stop] of the catalog."""
+
+    __slots__ = ("index", "title", "description", "questions", "start", "stop")
+
+    def __init__(self, index, title, description, questions, start, stop):
+        self.index = index
+        self.title = title
+        self.description = description
+        self.questions = questions
+        self.start = start
+        self.stop = stop
+
+    def __repr__(self):
+        return f"<Section {self.index}: {self.title}>"
+
+
+class Catalog:
+    """Immutable, indexed view of the assessment questions."""
+
+    def __init__(self, sections_data, version=None):
+        sections = []
+        questions = []
+        for section_index, raw_section in enumerate(sections_data):
+            start = len(questions)
+            for raw in raw_section["questions"]:
+                questions.append(Question(
+                    len(questions), raw["id"], raw["text"], raw["recommendation"], section_index
+                ))
+            sections.append(Section(
+                section_index,
+                raw_section["title"],
+                raw_section["description"],
+                tuple(questions[start:]),
+                start,
+                len(questions),
+            ))
+
+        index_of = {}
+        for q in questions:
+            if q.id in index_of:
+                raise ValueError(f"Duplicate question id in catalog: {q.id}")
+            index_of[q.id] = q.index
+
+        self.sections = tuple(sections)
+        self.questions = tuple(questions)
+        self.index_of = MappingProxyType(index_of)
+        self.total_questions = len(questions)
+        self.section_totals = tuple(s.stop - s.start for s in sections)
+        if version is None:
+            encoded = json.dumps(sections_data, sort_keys=True).encode("utf-8")
+            version = hashlib.sha256(encoded).hexdigest()[:16]
+        self.version = version
+
+    def __len__(self):
+        return self.total_questions
+
+    def question(self, question_id):
+        """Look up a question by id, or return None if it is not in the catalog."""
+        index = self.index_of.get(question_id)
+        return None if index is None else self.questions[index]
+
+    def encode_answers(self, answers):
+        """Turn an answer dict into a bytearray of status codes by position."""
+        codes = bytearray(self.total_questions)
+        index_of = self.index_of
+        for question_id, status in answers.items():
+            index = index_of.get(question_id)
+            code = STATUS_CODES.get(status)
+            if index is not None and code is not None:
+                codes[index] = code
+        return codes
+
+    def decode_answers(self, codes):
+        """Turn a sequence of status codes back into an answer dict."""
+        return {q.id: STATUSES[code] for q, code in zip(self.questions, codes)}
+
+    def validate_answers(self, answers):
+        """Keep only entries that name a known question and a valid status."""
+        return {
+            key: value for key, value in answers.items()
+            if key in self.index_of and value in STATUSES
+        }
+
+
+# --- CATALOG LOADING ---
+# The questions live in a JSON or YAML file (CATALOG_PATH). Parsed data is
+# cached next to it in marshal format, keyed on the file's size and mtime,
+# so a worker starts without re-parsing. The catalog version is a hash of
+# the file contents.
+
+CATALOG_CACHE_FORMAT = 1
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _parse_catalog(path, raw):
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise RuntimeError("YAML catalogs require PyYAML (pip install pyyaml).")
+        data = yaml.safe_load(raw)
+    else:
+        data = json.loads(raw)
+    if isinstance(data, dict):
+        data = data["sections"]
+    return data
+
+
+def load_catalog_data(path):
+    """Return (sections, version) for a catalog file, using its cache if fresh."""
+    signature = _file_signature(path)
+    cache_path = path + ".cache"
+    try:
+        with open(cache_path, "rb") as f:
+            cache_format, cached_signature, version, sections = marshal.load(f)
+        if cache_format == CATALOG_CACHE_FORMAT and tuple(cached_signature) == signature:
+            return sections, version
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    sections = _parse_catalog(path, raw)
+
+    # Write the cache atomically; a read-only deployment just skips it
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            marshal.dump((CATALOG_CACHE_FORMAT, signature, version, sections), f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return sections, version
+
+
+ISO_42001_SECTIONS, _catalog_version = load_catalog_data(app.config["CATALOG_PATH"])
+CATALOG = Catalog(ISO_42001_SECTIONS, _catalog_version)
+
+_catalog_listeners = []
+_catalog_lock = threading.Lock()
+
+
+def on_catalog_change(func):
+    """Register `func(catalog)` to run whenever a new catalog is installed.
+
+    Use it to drop caches keyed on the catalog version.
+    """
+    _catalog_listeners.append(func)
+    return func
+
+
+def current_catalog():
+    """Return the catalog for the current request.
+
+    The first call in a request pins the active catalog on `g`, so a hot
+    reload part way through a request cannot mix two catalog layouts.
+    Outside a request this is simply the active catalog.
+    """
+    if not has_request_context():
+        return CATALOG
+    catalog = g.get("catalog")
+    if catalog is None:
+        catalog = g.catalog = CATALOG
+    return catalog
 
 # --- HTML TEMPLATES (using Jinja2 syntax) ---
 
@@ -138,17 +289,13 @@ layout_template = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ISO/IEC 42001 Gap Assessment Tool</title>
-    <!-- Load Tailwind CSS -->
-    <script src="https://cdn.tailwindcss.com"></script>
-    <!-- Use Inter font family -->
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+    <!-- Precompiled Tailwind utilities and self-hosted Inter (see build_css.py) -->
+    <link rel="stylesheet" href="{{ asset_url('app.css') }}">
     <style>
-        body { font-family: 'Inter', sans-serif; }
+        body { font-family: 'Inter', ui-sans-serif, system-ui, sans-serif; }
         /* Print styles */
         @media print {
-            body { font-family: 'Inter', sans-serif; }
+            body { font-family: 'Inter', ui-sans-serif, system-ui, sans-serif; }
             #header, #report-buttons { display: none !important; }
             .assessment-container {
                 display: block !important;
@@ -179,9 +326,96 @@ layout_template = """
 
         <!-- Dynamic Content -->
         <div class="assessment-container bg-white p-8 rounded-lg shadow-lg">
-            {{ content|safe }}
+            {% block content %}{{ content|safe }}{% endblock %}
         </div>
     </div>
+    <script>
+    // Section pages: autosave answers as they change and move between
+    // sections by swapping in the section fragment, without a full reload.
+    // Without JavaScript the form posts and redirects as usual.
+    (function () {
+        var container = document.querySelector(".assessment-container");
+        var pending = {};
+        var timer = null;
+        var saving = Promise.resolve();
+
+        function flush() {
+            clearTimeout(timer);
+            var form = container.querySelector("form[data-autosave]");
+            var answers = pending;
+            pending = {};
+            if (!form || !Object.keys(answers).length) return saving;
+            var request = saving.then(function () {
+                return fetch(form.dataset.autosave, {
+                    method: "POST",
+                    headers: {"Content-Type": "application/json"},
+                    credentials: "same-origin",
+                    body: JSON.stringify({answers: answers})
+                });
+            }).then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            }).then(function (data) {
+                document.dispatchEvent(new CustomEvent("answers-saved", {detail: data}));
+            });
+            // Keep the chain usable after a failure: put the unsaved answers
+            // back (unless changed again since) so the next save retries them.
+            saving = request.catch(function () {
+                Object.keys(answers).forEach(function (name) {
+                    if (!(name in pending)) pending[name] = answers[name];
+                });
+                clearTimeout(timer);
+                timer = setTimeout(flush, 5000);
+            });
+            return request;
+        }
+
+        function load(url, push) {
+            return fetch(url + "?fragment=1", {credentials: "same-origin"}).then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.text();
+            }).then(function (html) {
+                container.innerHTML = html;
+                if (push) history.pushState({section: url}, "", url);
+                window.scrollTo(0, 0);
+            });
+        }
+
+        container.addEventListener("change", function (event) {
+            if (!event.target.matches("form[data-autosave] select")) return;
+            pending[event.target.name] = event.target.value;
+            clearTimeout(timer);
+            timer = setTimeout(flush, 400);
+        });
+
+        container.addEventListener("click", function (event) {
+            var button = event.target.closest("button[data-section-url]");
+            if (!button) return;
+            event.preventDefault();
+            flush().then(function () {
+                return load(button.dataset.sectionUrl, true);
+            }).catch(function () {
+                // Fall back to a regular form post, which saves every answer
+                var form = button.form;
+                var action = document.createElement("input");
+                action.type = "hidden";
+                action.name = button.name;
+                action.value = button.value;
+                form.appendChild(action);
+                form.submit();
+            });
+        });
+
+        window.addEventListener("popstate", function (event) {
+            if (event.state && event.state.section) {
+                load(event.state.section, false).catch(function () { location.reload(); });
+            }
+        });
+        if (container.querySelector("form[data-autosave]")) {
+            history.replaceState({section: location.pathname}, "", location.href);
+        }
+    })();
+    </script>
 </body>
 </html>
 """
@@ -204,7 +438,7 @@ welcome_template = """
 
 # Assessment page template
 assessment_template = """
-<form method="POST">
+<form method="POST" data-autosave="{{ url_for('api_save_answers') }}">
     <h2 class="text-2xl font-semibold text-gray-700 mb-2">{{ section.title }}</h2>
     <p class="text-gray-600 mb-6">{{ section.description }}</p>
     
@@ -231,7 +465,7 @@ assessment_template = """
     <!-- Navigation Buttons -->
     <div class="flex justify-between mt-8">
         {% if current_index > 0 %}
-            <button type="submit" name="action" value="prev" class="bg-gray-300 text-gray-700 font-semibold py-2 px-6 rounded-lg hover:bg-gray-400 transition duration-300">
+            <button type="submit" name="action" value="prev" data-section-url="{{ url_for('section', section_index=current_index - 1) }}" class="bg-gray-300 text-gray-700 font-semibold py-2 px-6 rounded-lg hover:bg-gray-400 transition duration-300">
                 Previous
             </button>
         {% else %}
@@ -239,7 +473,7 @@ assessment_template = """
         {% endif %}
         
         {% if current_index < total_sections - 1 %}
-            <button type="submit" name="action" value="next" class="bg-blue-600 text-white font-semibold py-2 px-6 rounded-lg shadow-md hover:bg-blue-700 transition duration-300">
+            <button type="submit" name="action" value="next" data-section-url="{{ url_for('section', section_index=current_index + 1) }}" class="bg-blue-600 text-white font-semibold py-2 px-6 rounded-lg shadow-md hover:bg-blue-700 transition duration-300">
                 Next
             </button>
         {% else %}
@@ -251,8 +485,9 @@ assessment_template = """
 </form>
 """
 
-# Report page template
-report_template = """
+# Report page template, in two parts so the summary can be sent before
+# the gap cards when the report is streamed
+report_summary_template = """
 <div class="flex justify-between items-center mb-6" id="report-buttons">
     <h2 class="text-3xl font-bold text-gray-800">Assessment Report</h2>
     <div class="space-x-2">
@@ -295,7 +530,9 @@ report_template = """
     </div>
 </div>
 
-<!-- Gap Analysis Section -->
+<!-- Gap Analysis Section -->"""
+
+report_gaps_template = """
 <h3 class="text-2xl font-semibold text-gray-700 mb-4">Gap Analysis & Recommendations</h3>
 <div class="space-y-4">
     {% if not gaps %}
@@ -323,42 +560,273 @@ report_template = """
 </div>
 """
 
+report_template = report_summary_template + report_gaps_template
+
+# Portfolio dashboard template
+dashboard_template = """
+<div class="flex justify-between items-center mb-6" id="report-buttons">
+    <h2 class="text-3xl font-bold text-gray-800">Portfolio Dashboard</h2>
+    <button onclick="window.print()" class="bg-blue-600 text-white font-semibold py-2 px-4 rounded-lg hover:bg-blue-700 transition duration-300">
+        Print Dashboard
+    </button>
+</div>
+
+<!-- Portfolio Summary -->
+<div class="bg-gray-50 p-6 rounded-lg border border-gray-200 mb-8">
+    <h3 class="text-xl font-semibold text-gray-700 mb-2">Across All Organizations</h3>
+    <p class="text-gray-600">
+        <strong>{{ assessments }}</strong> assessments, with an average of
+        <strong>{{ average_score }}%</strong> of requirements fully implemented.
+    </p>
+</div>
+
+<!-- Per-Clause Scores -->
+<h3 class="text-2xl font-semibold text-gray-700 mb-4">Average Score per Clause</h3>
+<div class="space-y-4 mb-8">
+    {% for s in sections %}
+        <div class="report-card bg-white p-6 rounded-lg border border-gray-200 shadow-sm">
+            <div class="flex justify-between items-start mb-2">
+                <h4 class="text-lg font-semibold text-gray-800">{{ s.title }}</h4>
+                <span class="text-sm font-medium py-1 px-3 rounded-full text-blue-600 bg-blue-100">{{ s.average_score }}%</span>
+            </div>
+            <div class="w-full bg-gray-200 rounded-full h-2.5 mb-3">
+                <div class="bg-blue-600 h-2.5 rounded-full" style="width: {{ s.average_score }}%"></div>
+            </div>
+            <p class="text-sm text-gray-500">
+                Of the gaps in this clause, {{ s.partial_ratio }}% are partially implemented
+                and {{ s.not_implemented_ratio }}% are not implemented.
+            </p>
+        </div>
+    {% endfor %}
+</div>
+
+<!-- Most Common Gaps -->
+<h3 class="text-2xl font-semibold text-gray-700 mb-4">Most Common Gaps</h3>
+<div class="space-y-4">
+    {% if not common_gaps %}
+        <div class="text-center text-gray-500 py-6 bg-gray-50 rounded-lg">
+            <p>No gaps recorded across the portfolio.</p>
+        </div>
+    {% else %}
+        {% for gap in common_gaps %}
+            <div class="report-card bg-white p-6 rounded-lg border border-gray-200 shadow-sm">
+                <div class="flex justify-between items-start mb-2">
+                    <h4 class="text-lg font-semibold text-gray-800">{{ gap.text }}</h4>
+                    <span class="text-sm font-medium py-1 px-3 rounded-full text-red-600 bg-red-100">{{ gap.gap_ratio }}%</span>
+                </div>
+                <p class="text-sm text-gray-500">
+                    Associated Requirement: {{ gap.id }} &middot;
+                    {{ gap.not_implemented }} not implemented, {{ gap.partial }} partially implemented
+                </p>
+            </div>
+        {% endfor %}
+    {% endif %}
+</div>
+"""
+
+# --- STATIC ASSETS ---
+# The stylesheet is generated ahead of time by build_css.py (only the
+# Tailwind utilities the templates use) and written to static/ under
+# content-hashed names listed in static/manifest.json. The files are read
+# into memory once and served with a one-year immutable lifetime; a
+# rebuild changes the names, so browsers never keep a stale copy.
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+class AssetManifest:
+    """Fingerprinted static files from a build manifest, held in memory."""
+
+    def __init__(self, static_dir):
+        self.names = {}
+        self.files = {}
+        try:
+            with open(os.path.join(static_dir, "manifest.json")) as f:
+                self.names = json.load(f)
+        except (OSError, ValueError):
+            app.logger.warning("static/manifest.json missing; run python build_css.py")
+        for hashed in self.names.values():
+            try:
+                with open(os.path.join(static_dir, hashed), "rb") as f:
+                    data = f.read()
+            except OSError:
+                app.logger.warning("static asset %s missing; run python build_css.py", hashed)
+                continue
+            mimetype = mimetypes.guess_type(hashed)[0] or "application/octet-stream"
+            self.files[hashed] = (data, mimetype, hashlib.sha1(data).hexdigest())
+        self.version = hashlib.sha1(
+            json.dumps(self.names, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def url(self, name):
+        """URL of the current build of a logical asset name, e.g. 'app.css'."""
+        return url_for("asset", filename=self.names.get(name, name))
+
+    def get(self, filename):
+        """Return (data, mimetype, etag) for a fingerprinted file, or None."""
+        return self.files.get(filename)
+
+
+assets = AssetManifest(STATIC_DIR)
+app.jinja_env.globals["asset_url"] = assets.url
+
+# --- TEMPLATE REGISTRY ---
+
+class TemplateRegistry:
+    """Compiles the page templates once and renders them inside the layout.
+
+    Each page is compiled as a child of the layout so a page and its shell
+    render in a single pass. Output that does not depend on the request
+    data (the welcome page, the layout shell) is rendered once and kept
+    in memory as bytes.
+    """
+
+    SHELL_MARKER = "<!--assessment-content-->"
+
+    def __init__(self, flask_app, layout_source, pages, fragments=None):
+        self.app = flask_app
+        env = flask_app.jinja_env
+        self.layout = env.from_string(layout_source)
+        self.fragments = {}
+        self.pages = {}
+        for name, source in pages.items():
+            self.fragments[name] = env.from_string(source)
+            # Jinja drops a single trailing newline from a standalone template;
+            # strip it here too so a page renders exactly as it did on its own.
+            body = source[:-1] if source.endswith("\n") else source
+            self.pages[name] = env.from_string(
+                "{% extends layout %}{% block content %}" + body + "{% endblock %}"
+            )
+        for name, source in (fragments or {}).items():
+            self.fragments[name] = env.from_string(source)
+        self._static = {}
+        digest = hashlib.sha1(layout_source.encode("utf-8"))
+        for name in sorted(pages):
+            digest.update(pages[name].encode("utf-8"))
+        self.version = digest.hexdigest()[:12]
+
+    def _context(self, context):
+        context = dict(context)
+        self.app.update_template_context(context)
+        return context
+
+    def render(self, name, **context):
+        """Render a full page (layout + body) in one pass."""
+        context["layout"] = self.layout
+        return self.pages[name].render(self._context(context))
+
+    def render_fragment(self, name, **context):
+        """Render only the body of a page, without the layout."""
+        return self.fragments[name].render(self._context(context))
+
+    def static_page(self, name):
+        """Return a page with no per-request data as cached bytes."""
+        key = (name, request.script_root)
+        body = self._static.get(key)
+        if body is None:
+            body = self.render(name).encode("utf-8")
+            self._static[key] = body
+        return body
+
+    def stream(self, names, chunk_size=8192, **context):
+        """Yield a full page as byte chunks.
+
+        The cached layout head goes out first, then each named fragment in
+        turn as Jinja generates it, then the layout tail. Output is flushed
+        every `chunk_size` characters and at the end of each fragment.
+        """
+        head, tail = self.shell()
+        context = self._context(context)
+        yield head
+        for name in names:
+            buffer = []
+            size = 0
+            for piece in self.fragments[name].generate(context):
+                buffer.append(piece)
+                size += len(piece)
+                if size >= chunk_size:
+                    yield "".join(buffer).encode("utf-8")
+                    buffer = []
+                    size = 0
+            if buffer:
+                yield "".join(buffer).encode("utf-8")
+        yield tail
+
+    def shell(self):
+        """Return the layout split into (head, tail) bytes around the content."""
+        key = ("__shell__", request.script_root)
+        shell = self._static.get(key)
+        if shell is None:
+            html = self.layout.render(self._context({"content": self.SHELL_MARKER}))
+            head, tail = html.split(self.SHELL_MARKER, 1)
+            shell = (head.encode("utf-8"), tail.encode("utf-8"))
+            self._static[key] = shell
+        return shell
+
+
+templates = TemplateRegistry(app, layout_template, {
+    "welcome": welcome_template,
+    "assessment": assessment_template,
+    "report": report_template,
+    "dashboard": dashboard_template,
+}, fragments={
+    "report_summary": report_summary_template,
+    "report_gaps": report_gaps_template,
+})
+
 # --- HELPER FUNCTION ---
 
+# Summary texts by tier; a score's tier is given by summary_tier().
+SUMMARY_TEXTS = (
+    "You have significant gaps. Use the report below to prioritize actions.",
+    "Good progress, but there are several key areas to address.",
+    "Great start! You have a solid foundation. Focus on the gaps below.",
+    "Excellent! You are fully aligned with all assessed requirements.",
+)
+
+
+def summary_tier(score):
+    """Map a 0-100 score to an index into SUMMARY_TEXTS."""
+    if score == 100:
+        return 3
+    elif score >= 75:
+        return 2
+    elif score >= 50:
+        return 1
+    return 0
+
+
+def compute_score(implemented_count, total_questions):
+    """Percentage of fully implemented questions, rounded to an int."""
+    if total_questions > 0:
+        return round((implemented_count / total_questions) * 100)
+    return 0
+
+
 def generate_report_data(answers):
     """Processes session answers into a report."""
+    catalog = current_catalog()
     implemented_count = 0
-    total_questions = 0
+    total_questions = catalog.total_questions
     gaps = []
 
-    for section in ISO_42001_SECTIONS:
-        for q in section["questions"]:
-            total_questions += 1
-            answer = answers.get(q["id"], "not_implemented")
-            
-            if answer == 'fully_implemented':
-                implemented_count += 1
-            else:
-                gaps.append({
-                    "id": q["id"],
-                    "text": q["text"],
-                    "recommendation": q["recommendation"],
-                    "status": answer
-                })
-
-    score = 0
-    if total_questions > 0:
-        score = round((implemented_count / total_questions) * 100)
+    for q in catalog.questions:
+        answer = answers.get(q.id, DEFAULT_STATUS)
+
+        if answer == 'fully_implemented':
+            implemented_count += 1
+        else:
+            gaps.append({
+                "id": q.id,
+                "text": q.text,
+                "recommendation": q.recommendation,
+                "status": answer
+            })
+
+    score = compute_score(implemented_count, total_questions)
 
     # Determine summary text based on score
-    if score == 100:
-        summary_text = "Excellent! You are fully aligned with all assessed requirements."
-    elif score >= 75:
-        summary_text = "Great start! You have a solid foundation. Focus on the gaps below."
-    elif score >= 50:
-        summary_text = "Good progress, but there are several key areas to address."
-    else:
-        summary_text = "You have significant gaps. Use the report below to prioritize actions."
+    summary_text = SUMMARY_TEXTS[summary_tier(score)]
 
     return {
         "score": score,
@@ -368,92 +836,2291 @@ def generate_report_data(answers):
         "summary_text": summary_text
     }
 
-# --- FLASK ROUTES ---
+# --- BATCH SCORING ---
+# Scores many assessments at once from an (assessments x questions) matrix
+# of int8 status codes. Results match generate_report_data() exactly for
+# valid answers; strip or reject anything else first (Catalog.validate_answers,
+# check_batch_item), as the request handlers do.
 
-@app.route("/")
-def index():
-    """Display the welcome page."""
-    session.clear() # Start fresh
-    content = render_template_string(welcome_template)
-    return render_template_string(layout_template, content=content)
+def status_matrix(answer_sets, catalog=None):
+    """Encode a sequence of answer dicts as an int8 status-code matrix.
 
-@app.route("/start")
-def start():
-    """Clear session and redirect to the first section."""
-    session.clear()
-    session['answers'] = {}
-    return redirect(url_for('section', section_index=0))
+    Raises ValueError on a status outside STATUSES; unknown question ids
+    are ignored, as in generate_report_data().
+    """
+    if np is None:
+        raise RuntimeError("Batch scoring requires NumPy (pip install numpy).")
+    catalog = catalog or current_catalog()
+    answer_sets = list(answer_sets)
+    matrix = np.zeros((len(answer_sets), catalog.total_questions), dtype=np.int8)
+    index_of = catalog.index_of
+    for row, answers in enumerate(answer_sets):
+        for question_id, status in answers.items():
+            index = index_of.get(question_id)
+            if index is None:
+                continue
+            code = STATUS_CODES.get(status)
+            if code is None:
+                raise ValueError(f"invalid status {status!r} for {question_id}")
+            matrix[row, index] = code
+    return matrix
 
-@app.route("/section/<int:section_index>", methods=["GET", "POST"])
-def section(section_index):
-    """Display a section of the assessment."""
-    
-    # Ensure 'answers' is in session
-    if 'answers' not in session:
-        session['answers'] = {}
 
-    total_sections = len(ISO_42001_SECTIONS)
+class BatchReport:
+    """Scores, counts, section breakdowns and gap masks for a batch."""
 
-    # Handle form submission
-    if request.method == "POST":
-        # Save answers from the form to the session
-        # Use request.form.to_dict() to get all form data
-        session['answers'].update(request.form.to_dict())
-        session.modified = True # Mark session as modified
-        
-        action = request.form.get('action')
-        
-        if action == "next":
-            next_index = section_index + 1
-            if next_index < total_sections:
-                return redirect(url_for('section', section_index=next_index))
-        elif action == "prev":
-            prev_index = section_index - 1
-            if prev_index >= 0:
-                return redirect(url_for('section', section_index=prev_index))
-        elif action == "report":
-            return redirect(url_for('report'))
+    def __init__(self, matrix, catalog=None):
+        if np is None:
+            raise RuntimeError("Batch scoring requires NumPy (pip install numpy).")
+        self.catalog = catalog or current_catalog()
+        self.matrix = matrix = np.asarray(matrix, dtype=np.int8)
+        total = self.catalog.total_questions
 
-    # Handle GET request
-    if 0 <= section_index < total_sections:
-        current_section = ISO_42001_SECTIONS[section_index]
-        progress = ((section_index + 1) / total_sections) * 100
-        saved_answers = session.get('answers', {})
-        
-        content = render_template_string(
-            assessment_template,
-            section=current_section,
-            current_index=section_index,
-            total_sections=total_sections,
-            progress=progress,
-            saved_answers=saved_answers
+        implemented = matrix == FULLY_IMPLEMENTED
+        self.gap_mask = ~implemented
+        self.implemented_count = implemented.sum(axis=1, dtype=np.int64)
+
+        # Per-section implemented counts via prefix sums over the offsets,
+        # which also copes with empty sections.
+        prefix = np.zeros((matrix.shape[0], total + 1), dtype=np.int64)
+        np.cumsum(implemented, axis=1, out=prefix[:, 1:])
+        starts = np.array([s.start for s in self.catalog.sections], dtype=np.intp)
+        stops = np.array([s.stop for s in self.catalog.sections], dtype=np.intp)
+        self.section_implemented = prefix[:, stops] - prefix[:, starts]
+
+        # Same arithmetic as generate_report_data: (count / total) * 100,
+        # rounded half to even like Python's round().
+        if total > 0:
+            self.score = np.rint((self.implemented_count / total) * 100).astype(np.int64)
+        else:
+            self.score = np.zeros(matrix.shape[0], dtype=np.int64)
+        self.tier = (
+            (self.score >= 50).astype(np.int8)
+            + (self.score >= 75)
+            + (self.score == 100)
         )
-        return render_template_string(layout_template, content=content)
-    else:
-        # Invalid index, redirect to start
-        return redirect(url_for('index'))
 
-@app.route("/report")
-def report():
-    """Generate and display the final report."""
-    answers = session.get('answers', {})
-    report_data = generate_report_data(answers)
-    
-    content = render_template_string(
-        report_template,
-        score=report_data['score'],
-        implemented_count=report_data['implemented_count'],
-        total_questions=report_data['total_questions'],
-        summary_text=report_data['summary_text'],
-        gaps=report_data['gaps']
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def gap_indices(self, row):
+        """Catalog positions of the gaps in one assessment."""
+        return np.flatnonzero(self.gap_mask[row])
+
+    def report(self, row):
+        """Build the generate_report_data() dict for one assessment."""
+        questions = self.catalog.questions
+        codes = self.matrix[row]
+        gaps = []
+        for index in self.gap_indices(row).tolist():
+            q = questions[index]
+            gaps.append({
+                "id": q.id,
+                "text": q.text,
+                "recommendation": q.recommendation,
+                "status": STATUSES[codes[index]]
+            })
+        return {
+            "score": int(self.score[row]),
+            "implemented_count": int(self.implemented_count[row]),
+            "total_questions": self.catalog.total_questions,
+            "gaps": gaps,
+            "summary_text": SUMMARY_TEXTS[self.tier[row]]
+        }
+
+
+def score_batch(answer_sets, catalog=None):
+    """Score a sequence of answer dicts in one vectorized pass."""
+    return BatchReport(status_matrix(answer_sets, catalog), catalog)
+
+# --- INCREMENTAL TALLIES ---
+# Per-section counts kept up to date on every section save, so a report
+# needs only the tallies and the gap rows instead of a pass over the
+# whole catalog.
+
+class ReportTally:
+    """Running implemented/partial counts for one assessment, by section."""
+
+    __slots__ = ("section_implemented", "section_partial")
+
+    def __init__(self, section_count):
+        self.section_implemented = [0] * section_count
+        self.section_partial = [0] * section_count
+
+    @classmethod
+    def from_codes(cls, codes, catalog=None):
+        """Build a tally from a full status-code vector."""
+        catalog = catalog or current_catalog()
+        tally = cls(len(catalog.sections))
+        for s in catalog.sections:
+            tally.update(s.index, codes[s.start:s.stop])
+        return tally
+
+    @staticmethod
+    def count(section_codes):
+        """Return (implemented, partial) counts for one section's codes."""
+        return (
+            section_codes.count(FULLY_IMPLEMENTED),
+            section_codes.count(STATUS_CODES["partially_implemented"]),
+        )
+
+    def update(self, section_index, section_codes):
+        """Replace one section's counts from that section's codes."""
+        implemented, partial = self.count(section_codes)
+        self.section_implemented[section_index] = implemented
+        self.section_partial[section_index] = partial
+
+    @property
+    def implemented_count(self):
+        return sum(self.section_implemented)
+
+    @property
+    def partial_count(self):
+        return sum(self.section_partial)
+
+
+class LazyGaps:
+    """Gap dicts built one at a time from (catalog index, status code) pairs.
+
+    Truthy when there is at least one gap, so templates can test and loop
+    over it like the list generate_report_data() returns without holding
+    every gap dict in memory.
+    """
+
+    __slots__ = ("pairs", "catalog")
+
+    def __init__(self, pairs, catalog):
+        self.pairs = pairs
+        self.catalog = catalog
+
+    def __bool__(self):
+        return bool(self.pairs)
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def __iter__(self):
+        questions = self.catalog.questions
+        for index, code in self.pairs:
+            q = questions[index]
+            yield {
+                "id": q.id,
+                "text": q.text,
+                "recommendation": q.recommendation,
+                "status": STATUSES[code]
+            }
+
+
+def build_report(tally, gaps, catalog=None, lazy=False):
+    """Assemble the generate_report_data() dict from a tally and its gaps.
+
+    `gaps` is a sequence of (catalog index, status code) pairs in catalog
+    order, as returned by SessionBackend.load_gaps(). With `lazy`, the
+    "gaps" entry is a LazyGaps instead of a list.
+    """
+    catalog = catalog or current_catalog()
+    implemented_count = tally.implemented_count
+    score = compute_score(implemented_count, catalog.total_questions)
+    gap_dicts = LazyGaps(gaps, catalog)
+    return {
+        "score": score,
+        "implemented_count": implemented_count,
+        "total_questions": catalog.total_questions,
+        "gaps": gap_dicts if lazy else list(gap_dicts),
+        "summary_text": SUMMARY_TEXTS[summary_tier(score)]
+    }
+
+# --- PORTFOLIO DASHBOARD ---
+# Cross-organization figures computed from per-question status counts that
+# the assessment store keeps up to date on every save (see
+# SQLiteAssessmentStore.status_counts). Cost depends on the catalog size,
+# not on how many assessments exist.
+
+def build_dashboard(status_counts, catalog=None, top_gaps=10):
+    """Summarize per-question [not, partial, fully] counts by section."""
+    catalog = catalog or current_catalog()
+    partial_code = STATUS_CODES["partially_implemented"]
+    not_code = STATUS_CODES["not_implemented"]
+    assessments = max((sum(counts) for counts in status_counts), default=0)
+
+    sections = []
+    for s in catalog.sections:
+        rows = status_counts[s.start:s.stop]
+        answers = assessments * len(rows)
+        implemented = sum(counts[FULLY_IMPLEMENTED] for counts in rows)
+        partial = sum(counts[partial_code] for counts in rows)
+        missing = sum(counts[not_code] for counts in rows)
+        gaps = partial + missing
+        sections.append({
+            "title": s.title,
+            "questions": len(rows),
+            "average_score": round(implemented / answers * 100, 1) if answers else 0.0,
+            "partial_ratio": round(partial / gaps * 100, 1) if gaps else 0.0,
+            "not_implemented_ratio": round(missing / gaps * 100, 1) if gaps else 0.0,
+        })
+
+    answers = assessments * catalog.total_questions
+    implemented = sum(counts[FULLY_IMPLEMENTED] for counts in status_counts)
+    ranked = sorted(
+        range(len(status_counts)),
+        key=lambda i: (-(assessments - status_counts[i][FULLY_IMPLEMENTED]), i),
     )
-    return render_template_string(layout_template, content=content)
+    common_gaps = []
+    for index in ranked[:top_gaps]:
+        counts = status_counts[index]
+        gap_count = assessments - counts[FULLY_IMPLEMENTED]
+        if gap_count <= 0:
+            break
+        q = catalog.questions[index]
+        common_gaps.append({
+            "id": q.id,
+            "text": q.text,
+            "gap_count": gap_count,
+            "gap_ratio": round(gap_count / assessments * 100, 1),
+            "partial": counts[partial_code],
+            "not_implemented": counts[not_code],
+        })
 
-@app.route("/reset")
-def reset():
-    """Clear session and redirect to the welcome page."""
-    session.clear()
-    return redirect(url_for('index'))
+    return {
+        "assessments": assessments,
+        "average_score": round(implemented / answers * 100, 1) if answers else 0.0,
+        "sections": sections,
+        "common_gaps": common_gaps,
+    }
+
+# --- SEARCH INDEX ---
+# An inverted index over question text and recommendations, rebuilt each
+# time a catalog is installed. A query touches only the posting lists of
+# its terms; the last term also matches as a prefix, for typeahead.
+
+# Matched against the original text and lowercased per token, so match
+# positions stay valid for slicing it (str.lower() can change the length).
+SEARCH_TOKEN = re.compile(r"[a-z0-9]+", re.ASCII | re.IGNORECASE)
+SEARCH_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how in is it its of on or "
+    "that the their there this to was what when where which who will with".split()
+)
+# Field weights: a match in the question counts double one in the recommendation
+SEARCH_FIELDS = (("text", 2.0), ("recommendation", 1.0))
+# Prefix matches rank a little below whole-word matches
+SEARCH_PREFIX_WEIGHT = 0.8
+SEARCH_MAX_EXPANSIONS = 50
+SEARCH_SNIPPET_WIDTH = 160
+
+
+def normalize_term(token):
+    """Fold simple English plurals so "policies" finds "policy"."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is", "as", "os")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Split text into normalized index terms, dropping stopwords."""
+    return [
+        normalize_term(token) for token in map(str.lower, SEARCH_TOKEN.findall(text))
+        if token not in SEARCH_STOPWORDS
+    ]
+
+
+class SearchIndex:
+    """Inverted index of a catalog's question text and recommendations."""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        postings = {}
+        # A word as it appears in the catalog, for showing completions
+        self.surface = {}
+        for q in catalog.questions:
+            for field, weight in SEARCH_FIELDS:
+                for word in map(str.lower, SEARCH_TOKEN.findall(getattr(q, field))):
+                    if word in SEARCH_STOPWORDS:
+                        continue
+                    term = normalize_term(word)
+                    self.surface.setdefault(term, word)
+                    doc = postings.setdefault(term, {})
+                    doc[q.index] = doc.get(q.index, 0.0) + weight
+        total = max(catalog.total_questions, 1)
+        self.idf = {term: math.log(1 + total / len(doc)) for term, doc in postings.items()}
+        self.postings = postings
+        self.terms = sorted(postings)
+
+    def expand(self, prefix):
+        """Indexed terms that start with `prefix`, most frequent first."""
+        start = bisect_left(self.terms, prefix)
+        matches = []
+        for term in self.terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        matches.sort(key=lambda term: -len(self.postings[term]))
+        return matches[:SEARCH_MAX_EXPANSIONS]
+
+    def _term_scores(self, term, prefix):
+        """{question index: score} for one query term."""
+        scores = {}
+        matches = self.expand(term) if prefix else ([term] if term in self.postings else [])
+        for match in matches:
+            boost = self.idf[match] * (1.0 if match == term else SEARCH_PREFIX_WEIGHT)
+            for index, weight in self.postings[match].items():
+                score = weight * boost
+                if score > scores.get(index, 0.0):
+                    scores[index] = score
+        return scores
+
+    def search(self, query, limit=10, within=None):
+        """Return (question, score, terms) for the best matches of `query`.
+
+        Every term must match; the last one may match as a prefix.
+        `within` restricts the results to a set of catalog indexes.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        prefix_last = not query[-1:].isspace()
+        total = None
+        matched = set()
+        for position, term in enumerate(terms):
+            is_prefix = prefix_last and position == len(terms) - 1
+            scores = self._term_scores(term, is_prefix)
+            if within is not None:
+                scores = {index: score for index, score in scores.items() if index in within}
+            if total is None:
+                total = scores
+            else:
+                total = {index: score + scores[index] for index, score in total.items() if index in scores}
+            if not total:
+                return []
+            matched.update(self.expand(term) if is_prefix else (term,))
+        ranked = sorted(total.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        questions = self.catalog.questions
+        return [(questions[index], round(score, 3), matched) for index, score in ranked]
+
+    def complete(self, query, limit=5):
+        """Completions of the last word of `query`, most frequent first."""
+        last = None
+        for last in SEARCH_TOKEN.finditer(query):
+            pass
+        if last is None or query[-1:].isspace():
+            return []
+        head = query[:last.start()]
+        terms = self.expand(normalize_term(last.group().lower()))[:limit]
+        return [head + self.surface[term] for term in terms]
+
+
+def highlight(text, terms, width=None):
+    """HTML-escape `text`, wrapping words that match `terms` in <mark>.
+
+    With `width`, returns a window of about that many characters around
+    the first match, with ellipses where text was cut.
+    """
+    spans = [
+        match.span() for match in SEARCH_TOKEN.finditer(text)
+        if normalize_term(match.group().lower()) in terms
+    ]
+    start, end = 0, len(text)
+    if width is not None and len(text) > width:
+        first = spans[0][0] if spans else 0
+        start = max(0, min(first - width // 4, len(text) - width))
+        end = start + width
+    out = ["&hellip;" if start > 0 else ""]
+    position = start
+    for span_start, span_end in spans:
+        if span_start < start or span_end > end:
+            continue
+        out.append(str(escape(text[position:span_start])))
+        out.append("<mark>" + str(escape(text[span_start:span_end])) + "</mark>")
+        position = span_end
+    out.append(str(escape(text[position:end])))
+    if end < len(text):
+        out.append("&hellip;")
+    return "".join(out)
+
+
+search_index = SearchIndex(CATALOG)
+
+
+@on_catalog_change
+def _rebuild_search_index(catalog):
+    global search_index
+    search_index = SearchIndex(catalog)
+
+# --- ASSESSMENT HISTORY ---
+# Snapshots are packed status vectors (pack_codes) taken when an
+# assessment is submitted, deduplicated against the end of their series.
+# Diffs and trends run on the snapshot matrix, aligned to the current
+# catalog, with whole-array comparisons instead of per-question loops.
+
+def unpack_code_matrix(packed_rows, count):
+    """Unpack pack_codes() vectors of `count` codes into an int8 matrix."""
+    width = (count + 3) // 4
+    packed = np.frombuffer(b"".join(packed_rows), dtype=np.uint8).reshape(len(packed_rows), width)
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+    codes = (packed[:, :, None] >> shifts) & 3
+    return codes.reshape(len(packed_rows), width * 4)[:, :count].astype(np.int8)
+
+
+class SnapshotSeries:
+    """Scores and gap changes across snapshots of an assessment history."""
+
+    def __init__(self, snapshots, matrix, catalog=None):
+        self.snapshots = snapshots
+        self.batch = BatchReport(matrix, catalog)
+        self.catalog = self.batch.catalog
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def _changes(self, indexes, before, after):
+        questions = self.catalog.questions
+        return [
+            {
+                "id": questions[i].id,
+                "text": questions[i].text,
+                "before": STATUSES[before[i]],
+                "after": STATUSES[after[i]],
+            }
+            for i in indexes.tolist()
+        ]
+
+    def diff(self, a=0, b=-1):
+        """Compare snapshot `a` to snapshot `b` (positions in the series)."""
+        matrix = self.batch.matrix
+        gap = self.batch.gap_mask
+        before, after = matrix[a], matrix[b]
+        score_before = int(self.batch.score[a])
+        score_after = int(self.batch.score[b])
+        section_change = self.batch.section_implemented[b] - self.batch.section_implemented[a]
+        return {
+            "from": self.snapshots[a],
+            "to": self.snapshots[b],
+            "score_before": score_before,
+            "score_after": score_after,
+            "score_change": score_after - score_before,
+            "closed_gaps": self._changes(np.flatnonzero(gap[a] & ~gap[b]), before, after),
+            "new_gaps": self._changes(np.flatnonzero(~gap[a] & gap[b]), before, after),
+            # Still gaps, but moved between not and partially implemented
+            "improved": self._changes(np.flatnonzero(gap[b] & (after > before)), before, after),
+            "regressed": self._changes(np.flatnonzero(gap[a] & (after < before)), before, after),
+            "sections": [
+                {"title": s.title, "implemented_change": int(change)}
+                for s, change in zip(self.catalog.sections, section_change.tolist())
+            ],
+        }
+
+    def trend(self):
+        """One point per snapshot: score, gap count and change since the previous one."""
+        gap = self.batch.gap_mask
+        closed = np.zeros(len(self), dtype=np.int64)
+        opened = np.zeros(len(self), dtype=np.int64)
+        score_change = np.zeros(len(self), dtype=np.int64)
+        if len(self) > 1:
+            closed[1:] = (gap[:-1] & ~gap[1:]).sum(axis=1)
+            opened[1:] = (~gap[:-1] & gap[1:]).sum(axis=1)
+            score_change[1:] = np.diff(self.batch.score)
+        gap_count = gap.sum(axis=1)
+        return [
+            dict(
+                snapshot,
+                score=int(self.batch.score[row]),
+                gap_count=int(gap_count[row]),
+                score_change=int(score_change[row]),
+                closed_gaps=int(closed[row]),
+                new_gaps=int(opened[row]),
+            )
+            for row, snapshot in enumerate(self.snapshots)
+        ]
+
+
+def load_history(store=None, **selector):
+    """Build a SnapshotSeries from store.snapshots(**selector)."""
+    store = store or answer_store
+    catalog = current_catalog()
+    snapshots = store.snapshots(**selector)
+    matrix = store.load_snapshot_matrix((snapshot["id"] for snapshot in snapshots), catalog)
+    return SnapshotSeries(snapshots, matrix, catalog)
+
+# --- INSTRUMENTATION ---
+# Per-route latency histograms, per-phase timings and a few counters, all
+# exposed in Prometheus text format at /metrics.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; the last slot counts values above all buckets."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Thread-safe registry of histograms and counters."""
+
+    HELP = {
+        "iso42001_request_duration_seconds": ("histogram", "Request latency by route."),
+        "iso42001_request_phase_seconds": (
+            "histogram", "Time spent in each phase of a request, by route."),
+        "iso42001_assessments_started_total": ("counter", "Assessments started via /start."),
+        "iso42001_assessments_completed_total": (
+            "counter", "Assessments submitted from their last section."),
+        "iso42001_reports_generated_total": ("counter", "Reports generated."),
+        "iso42001_answers_autosaved_total": (
+            "counter", "Answers changed through the autosave API."),
+        "iso42001_batch_assessments_scored_total": (
+            "counter", "Answer sets scored through the batch API."),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {
+            name: 0 for name, (kind, _) in self.HELP.items() if kind == "counter"
+        }
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as phase `name` of the current request."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if has_request_context():
+                self.observe(
+                    "iso42001_request_phase_seconds",
+                    {"route": _route_label(), "phase": name},
+                    time.perf_counter() - start,
+                )
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(
+                (key, list(h.counts), h.sum, h.count) for key, h in self._histograms.items()
+            )
+            counters = dict(self._counters)
+
+        lines = []
+        for name, (kind, help_text) in self.HELP.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                lines.append(f"{name} {counters[name]}")
+                continue
+            for (metric, labels), counts, total, count in histograms:
+                if metric != name:
+                    continue
+                label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels)
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{label_text}}} {total}")
+                lines.append(f"{name}_count{{{label_text}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _route_label():
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+class SamplingProfiler:
+    """Samples the stacks of in-flight request threads at a fixed interval.
+
+    A single background thread runs while at least one request is being
+    profiled; samples are kept as collapsed stacks ("a;b;c" -> count).
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = {}
+        self._thread = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._active[thread_id] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self, thread_id):
+        """Stop sampling `thread_id` and return its collapsed stacks."""
+        with self._lock:
+            return self._active.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[_collapse_stack(frame)] += 1
+
+
+def _collapse_stack(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+metrics = Metrics()
+profiler = SamplingProfiler()
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    if app.config["PROFILE_THRESHOLD_MS"]:
+        g.profiled_thread = threading.get_ident()
+        profiler.start(g.profiled_thread)
+
+
+@app.teardown_request
+def _record_request_timing(exc):
+    started = g.pop("request_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    route = _route_label()
+    metrics.observe("iso42001_request_duration_seconds", {"route": route}, elapsed)
+
+    thread_id = g.pop("profiled_thread", None)
+    if thread_id is None:
+        return
+    samples = profiler.stop(thread_id)
+    if samples and elapsed * 1000 >= app.config["PROFILE_THRESHOLD_MS"]:
+        _dump_profile(route, elapsed, samples)
+
+
+def _dump_profile(route, elapsed, samples):
+    """Write collapsed stacks (flamegraph.pl / speedscope format) for a slow request."""
+    directory = app.config["PROFILE_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "index"
+    path = os.path.join(
+        directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(elapsed * 1000)}ms-{slug}.folded"
+    )
+    with open(path, "w") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+    app.logger.warning("Slow request %s took %.0f ms; profile written to %s",
+                       request.path, elapsed * 1000, path)
+
+# --- HTTP CACHING ---
+# Pages get weak ETags derived from what they are rendered from (catalog
+# version, template version, page, and the answers shown on it), so a
+# reload with unchanged answers is a 304 with no rendering. Rendered pages
+# and their compressed forms are kept in bounded LRU caches under the
+# same key.
+
+class LRUCache:
+    """Thread-safe mapping that drops the least recently used entry when full."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+render_cache = LRUCache(app.config["RENDER_CACHE_SIZE"])
+compressed_cache = LRUCache(app.config["RENDER_CACHE_SIZE"])
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/plain", "text/csv", "text/css", "application/json",
+    "application/x-ndjson", "application/javascript",
+}
+COMPRESSION_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def make_etag(*parts):
+    """Hash the inputs a page is rendered from into an ETag value."""
+    digest = hashlib.sha1()
+    for part in (current_catalog().version, templates.version, assets.version, request.script_root) + parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def not_modified(etag):
+    """Return a 304 response if the client already has `etag`, else None."""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    return None
+
+
+def cached_page(etag, render):
+    """Serve the page for `etag` from the render cache, calling `render` on a miss."""
+    body = render_cache.get(etag)
+    if body is None:
+        body = render()
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        render_cache.put(etag, body)
+    response = Response(body, mimetype="text/html")
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@on_catalog_change
+def _clear_page_caches(catalog):
+    render_cache.clear()
+    compressed_cache.clear()
+
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _compress_stream(chunks, encoding):
+    """Compress a streamed body chunk by chunk, flushing after each chunk."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+@app.after_request
+def _compress_response(response):
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(COMPRESSION_ENCODINGS)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop("Content-Length", None)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    data = response.get_data()
+    if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+    etag, _ = response.get_etag()
+    cache_key = (etag, encoding) if etag else None
+    compressed = compressed_cache.get(cache_key) if cache_key else None
+    if compressed is None:
+        compressed = _compress(data, encoding)
+        if cache_key:
+            compressed_cache.put(cache_key, compressed)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+# --- SESSION STORE ---
+# Answers live server-side; the signed cookie only carries an opaque id.
+# Status vectors can be packed at 2 bits per question for compact storage;
+# assessment history snapshots use this (see unpack_code_matrix()).
+
+def pack_codes(codes):
+    """Pack status codes (0-3) four to a byte."""
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << ((i & 3) << 1)
+    return bytes(packed)
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections to one database file, in WAL mode.
+
+    Inside an app context a connection is checked out once and handed back
+    when the context tears down, so each request reuses a pooled connection
+    (and its prepared statement cache) and at most `size` idle connections
+    stay open. Outside one (CLI commands, scripts) each thread keeps its own
+    connection until close_all(). The schema is applied once per pool.
+    """
+
+    def __init__(self, path, schema="", size=8):
+        self.path = path
+        self.schema = schema
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_connections = []
+        self._initialized = False
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=30, cached_statements=256,
+                               check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    if self.schema:
+                        conn.executescript(self.schema)
+                    self._initialized = True
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._open()
+
+    def release(self, conn):
+        """Return a checked-out connection; surplus connections are closed."""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def connection(self):
+        if has_app_context():
+            held = g.setdefault("_db_connections", {})
+            if id(self) not in held:
+                held[id(self)] = (self, self._acquire())
+            return held[id(self)][1]
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            with self._lock:
+                self._thread_connections.append(conn)
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._thread_connections:
+                conn.close()
+            self._thread_connections.clear()
+        self._local = threading.local()
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SessionBackend:
+    """Interface for server-side answer storage keyed by an opaque id.
+
+    Backends deal in status-code vectors aligned to the catalog, see
+    Catalog.encode_answers().
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def set_catalog(self, catalog):
+        """Switch to a new catalog. Stored codes are not migrated."""
+        self.catalog = catalog
+
+    def create(self, **meta):
+        """Start a new, empty set of answers and return its key."""
+        return secrets.token_urlsafe(16)
+
+    # Methods that take `catalog` lay their results out by that catalog
+    # (default: the backend's), so a request keeps one catalog throughout
+    # even if a reload swaps the backend's catalog meanwhile.
+
+    def load(self, key, catalog=None):
+        """Return the full code vector for `key` (all zeros if unknown)."""
+        raise NotImplementedError
+
+    def save_section(self, key, section, codes):
+        """Store the codes for one Section, replacing what was there."""
+        raise NotImplementedError
+
+    def load_tally(self, key, catalog=None):
+        """Return the ReportTally for `key`.
+
+        Backends that keep running tallies override this; the default
+        recomputes it from the stored codes.
+        """
+        catalog = catalog or self.catalog
+        return ReportTally.from_codes(self.load(key, catalog), catalog)
+
+    def load_gaps(self, key, catalog=None):
+        """Return (catalog index, status code) for every gap, in catalog order."""
+        return [
+            (index, code) for index, code in enumerate(self.load(key, catalog))
+            if code != FULLY_IMPLEMENTED
+        ]
+
+# --- ASSESSMENT STORE ---
+# Assessments and their answers persist across sessions. Every assessment
+# has one answer row per catalog question (seeded as not implemented), so
+# "which assessments have gap X" is a range scan on one index.
+
+class SQLiteAssessmentStore(SessionBackend):
+    """Persistent SessionBackend keyed by assessment id."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS assessments (
+            id INTEGER PRIMARY KEY,
+            org TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_assessments_org_updated
+            ON assessments (org, updated_at DESC);
+        CREATE TABLE IF NOT EXISTS answers (
+            assessment_id INTEGER NOT NULL REFERENCES assessments (id) ON DELETE CASCADE,
+            question_id TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            PRIMARY KEY (assessment_id, question_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_answers_gap
+            ON answers (question_id, status, assessment_id);
+        CREATE TABLE IF NOT EXISTS section_tallies (
+            assessment_id INTEGER NOT NULL REFERENCES assessments (id) ON DELETE CASCADE,
+            section INTEGER NOT NULL,
+            implemented INTEGER NOT NULL,
+            partial INTEGER NOT NULL,
+            PRIMARY KEY (assessment_id, section)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS question_status_counts (
+            question_id TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (question_id, status)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY,
+            org TEXT NOT NULL,
+            assessment_id INTEGER NOT NULL,
+            catalog_version TEXT NOT NULL,
+            taken_at REAL NOT NULL,
+            codes BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_snapshots_org ON snapshots (org, id);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_assessment ON snapshots (assessment_id, id);
+        CREATE TABLE IF NOT EXISTS snapshot_catalogs (
+            version TEXT PRIMARY KEY,
+            question_ids TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    # Bump when the materialized rollups change shape; stores on an older
+    # version rebuild them from the answers table on first use.
+    ROLLUP_VERSION = "1"
+
+    UPSERT_ANSWER = (
+        "INSERT INTO answers (assessment_id, question_id, status) VALUES (?, ?, ?) "
+        "ON CONFLICT (assessment_id, question_id) DO UPDATE SET status = excluded.status"
+    )
+
+    ADD_STATUS_COUNT = (
+        "INSERT INTO question_status_counts (question_id, status, count) VALUES (?, ?, ?) "
+        "ON CONFLICT (question_id, status) DO UPDATE SET count = count + excluded.count"
+    )
+
+    def __init__(self, catalog, path):
+        super().__init__(catalog)
+        self.pool = ConnectionPool(path, self.SCHEMA)
+        self._synced_version = None
+        self._sync_lock = threading.Lock()
+
+    def _connection(self):
+        conn = self.pool.connection()
+        if self._synced_version != self.catalog.version:
+            self._sync_catalog(conn)
+        return conn
+
+    def _sync_catalog(self, conn):
+        """Bring stored data in line with the current catalog version.
+
+        Answers are keyed by question id and survive catalog changes. New
+        questions are seeded as not implemented so gap lookups see them,
+        the per-section tallies are dropped so load_tally() rebuilds them
+        against the new section layout, and the portfolio rollups are
+        recounted.
+        """
+        with self._sync_lock:
+            catalog = self.catalog
+            if self._synced_version == catalog.version:
+                return
+            with conn:
+                meta = dict(conn.execute("SELECT key, value FROM store_meta"))
+                rebuild_rollups = meta.get("rollup_version") != self.ROLLUP_VERSION
+                if meta.get("catalog_version") != catalog.version:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO answers (assessment_id, question_id, status) "
+                        "SELECT id, ?, 0 FROM assessments",
+                        ((q.id,) for q in catalog.questions),
+                    )
+                    conn.execute("DELETE FROM section_tallies")
+                    rebuild_rollups = True
+                if rebuild_rollups:
+                    conn.execute("DELETE FROM question_status_counts")
+                    conn.execute(
+                        "INSERT INTO question_status_counts (question_id, status, count) "
+                        "SELECT question_id, status, COUNT(*) FROM answers "
+                        "GROUP BY question_id, status"
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                    (("catalog_version", catalog.version),
+                     ("rollup_version", self.ROLLUP_VERSION)),
+                )
+            self._synced_version = catalog.version
+
+    def _insert(self, conn, org, assessment_id=None):
+        now = time.time()
+        cursor = conn.execute(
+            "INSERT INTO assessments (id, org, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (assessment_id, org, now, now),
+        )
+        assessment_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO answers (assessment_id, question_id, status) VALUES (?, ?, 0)",
+            ((assessment_id, q.id) for q in self.catalog.questions),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO section_tallies (assessment_id, section, implemented, partial) "
+            "VALUES (?, ?, 0, 0)",
+            ((assessment_id, section.index) for section in self.catalog.sections),
+        )
+        conn.executemany(
+            self.ADD_STATUS_COUNT, ((q.id, 0, 1) for q in self.catalog.questions)
+        )
+        return assessment_id
+
+    def create(self, org=""):
+        conn = self._connection()
+        with conn:
+            return self._insert(conn, org)
+
+    def load(self, key, catalog=None):
+        catalog = catalog or self.catalog
+        codes = bytearray(catalog.total_questions)
+        index_of = catalog.index_of
+        rows = self._connection().execute(
+            "SELECT question_id, status FROM answers WHERE assessment_id = ?", (key,)
+        )
+        for question_id, status in rows:
+            index = index_of.get(question_id)
+            if index is not None:
+                codes[index] = status
+        return codes
+
+    def save_section(self, key, section, codes):
+        # Answers are written by the ids of `section`'s own questions, so
+        # they land correctly even if the catalog was reloaded since the
+        # section was read.
+        questions = section.questions
+        sections = self.catalog.sections
+        current = section.index < len(sections) and sections[section.index] is section
+        conn = self._connection()
+        with conn:
+            updated = conn.execute(
+                "UPDATE assessments SET updated_at = ? WHERE id = ?", (time.time(), key)
+            )
+            if updated.rowcount == 0:
+                self._insert(conn, "", key)
+            previous = dict(conn.execute(
+                "SELECT question_id, status FROM answers WHERE assessment_id = ? "
+                f"AND question_id IN ({','.join('?' * len(questions))})",
+                (key, *(q.id for q in questions)),
+            ))
+            conn.executemany(
+                self.UPSERT_ANSWER,
+                ((key, q.id, code) for q, code in zip(questions, codes)),
+            )
+            # Move each changed answer between status buckets in the rollups
+            deltas = []
+            for q, code in zip(questions, codes):
+                old = previous.get(q.id)
+                if old != code:
+                    if old is not None:
+                        deltas.append((q.id, old, -1))
+                    deltas.append((q.id, code, 1))
+            conn.executemany(self.ADD_STATUS_COUNT, deltas)
+            if current:
+                implemented, partial = ReportTally.count(bytes(codes))
+                conn.execute(
+                    "INSERT OR REPLACE INTO section_tallies "
+                    "(assessment_id, section, implemented, partial) VALUES (?, ?, ?, ?)",
+                    (key, section.index, implemented, partial),
+                )
+            else:
+                # A section of a replaced catalog; let load_tally() rebuild
+                conn.execute("DELETE FROM section_tallies WHERE assessment_id = ?", (key,))
+
+    def delete(self, key):
+        conn = self._connection()
+        with conn:
+            rows = conn.execute(
+                "SELECT question_id, status FROM answers WHERE assessment_id = ?", (key,)
+            ).fetchall()
+            conn.executemany(
+                self.ADD_STATUS_COUNT, ((qid, status, -1) for qid, status in rows)
+            )
+            conn.execute("DELETE FROM assessments WHERE id = ?", (key,))
+
+    def status_counts(self):
+        """Return [[not, partial, fully], ...] assessment counts for each catalog question.
+
+        Read from the materialized rollups, so the cost depends only on the
+        size of the catalog.
+        """
+        counts = [[0] * len(STATUSES) for _ in range(self.catalog.total_questions)]
+        index_of = self.catalog.index_of
+        rows = self._connection().execute(
+            "SELECT question_id, status, count FROM question_status_counts"
+        )
+        for question_id, status, count in rows:
+            index = index_of.get(question_id)
+            if index is not None and 0 <= status < len(STATUSES):
+                counts[index][status] = count
+        return counts
+
+    def load_tally(self, key, catalog=None):
+        catalog = catalog or self.catalog
+        if catalog is not self.catalog:
+            # Stored tallies follow the store's catalog; recount for another
+            return super().load_tally(key, catalog)
+        section_count = len(catalog.sections)
+        tally = ReportTally(section_count)
+        seen = 0
+        rows = self._connection().execute(
+            "SELECT section, implemented, partial FROM section_tallies WHERE assessment_id = ?",
+            (key,),
+        )
+        for section_index, implemented, partial in rows:
+            if 0 <= section_index < section_count:
+                tally.section_implemented[section_index] = implemented
+                tally.section_partial[section_index] = partial
+                seen += 1
+        if seen != section_count:
+            # Rows written before tallies existed, or dropped after a
+            # catalog change; rebuild from the answers
+            tally = super().load_tally(key, catalog)
+            conn = self._connection()
+            with conn:
+                if catalog is self.catalog:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO section_tallies "
+                        "(assessment_id, section, implemented, partial) VALUES (?, ?, ?, ?)",
+                        (
+                            (key, i, tally.section_implemented[i], tally.section_partial[i])
+                            for i in range(section_count)
+                        ),
+                    )
+        return tally
+
+    def load_gaps(self, key, catalog=None):
+        index_of = (catalog or self.catalog).index_of
+        rows = self._connection().execute(
+            "SELECT question_id, status FROM answers WHERE assessment_id = ? AND status < ?",
+            (key, FULLY_IMPLEMENTED),
+        )
+        gaps = [(index_of[qid], status) for qid, status in rows if qid in index_of]
+        gaps.sort()
+        return gaps
+
+    def latest_for_org(self, org):
+        """Return the id of the most recently updated assessment for `org`."""
+        row = self._connection().execute(
+            "SELECT id FROM assessments WHERE org = ? ORDER BY updated_at DESC LIMIT 1",
+            (org,),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def assessments_with_gap(self, question_id):
+        """Yield the ids of assessments where `question_id` is not fully implemented."""
+        rows = self._connection().execute(
+            "SELECT assessment_id FROM answers WHERE question_id = ? AND status < ?",
+            (question_id, FULLY_IMPLEMENTED),
+        )
+        for (assessment_id,) in rows:
+            yield assessment_id
+
+    def iter_batches(self, batch_size=500):
+        """Yield every assessment in id order, `batch_size` at a time.
+
+        Each batch is a list of ((id, org, created_at, updated_at), codes)
+        pairs. Pages are read by keyset on the primary key, so memory stays
+        bounded by the batch size however many assessments exist.
+        """
+        conn = self._connection()
+        index_of = self.catalog.index_of
+        total = self.catalog.total_questions
+        last_id = 0
+        while True:
+            metas = conn.execute(
+                "SELECT id, org, created_at, updated_at FROM assessments "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not metas:
+                return
+            first_id, last_id = metas[0][0], metas[-1][0]
+            codes = {meta[0]: bytearray(total) for meta in metas}
+            rows = conn.execute(
+                "SELECT assessment_id, question_id, status FROM answers "
+                "WHERE assessment_id BETWEEN ? AND ?",
+                (first_id, last_id),
+            )
+            for assessment_id, question_id, status in rows:
+                index = index_of.get(question_id)
+                if index is not None:
+                    codes[assessment_id][index] = status
+            yield [(tuple(meta), bytes(codes[meta[0]])) for meta in metas]
+
+    def _latest_snapshot(self, conn, org, assessment_id):
+        if org:
+            query = "SELECT id, catalog_version, codes FROM snapshots WHERE org = ?"
+            params = (org,)
+        else:
+            query = "SELECT id, catalog_version, codes FROM snapshots WHERE assessment_id = ? AND org = ''"
+            params = (assessment_id,)
+        return conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+
+    def take_snapshot(self, assessment_id):
+        """Record an assessment's current answers in its history.
+
+        An assessment's history is its organization's (or, without an org,
+        its own) series of snapshots. If the series already ends with the
+        same answers on the same catalog version, nothing is written and
+        that snapshot's id is returned. Returns None for an unknown id.
+        """
+        conn = self._connection()
+        row = conn.execute("SELECT org FROM assessments WHERE id = ?", (assessment_id,)).fetchone()
+        if row is None:
+            return None
+        org = row[0]
+        catalog = self.catalog
+        packed = pack_codes(self.load(assessment_id, catalog))
+        with conn:
+            latest = self._latest_snapshot(conn, org, assessment_id)
+            if latest is not None and latest[1] == catalog.version and latest[2] == packed:
+                return latest[0]
+            conn.execute(
+                "INSERT OR IGNORE INTO snapshot_catalogs (version, question_ids) VALUES (?, ?)",
+                (catalog.version, json.dumps([q.id for q in catalog.questions])),
+            )
+            return conn.execute(
+                "INSERT INTO snapshots (org, assessment_id, catalog_version, taken_at, codes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (org, assessment_id, catalog.version, time.time(), packed),
+            ).lastrowid
+
+    def snapshots(self, org=None, assessment_id=None, ids=None):
+        """Return snapshot metadata dicts, oldest first.
+
+        Selects an organization's series, one assessment's snapshots, or
+        the given snapshot ids.
+        """
+        if ids is not None:
+            ids = list(ids)
+            where = f"id IN ({','.join('?' * len(ids))})"
+            params = ids
+        elif org:
+            where, params = "org = ?", (org,)
+        else:
+            where, params = "assessment_id = ?", (assessment_id,)
+        rows = self._connection().execute(
+            "SELECT id, org, assessment_id, catalog_version, taken_at FROM snapshots "
+            f"WHERE {where} ORDER BY id",
+            params,
+        )
+        return [
+            {"id": row[0], "org": row[1], "assessment_id": row[2],
+             "catalog_version": row[3], "taken_at": row[4]}
+            for row in rows
+        ]
+
+    def load_snapshot_matrix(self, snapshot_ids, catalog=None):
+        """Return the snapshots' status codes as an int8 matrix, one row each.
+
+        Rows follow `snapshot_ids` and columns `catalog` (default: the
+        store's), so snapshots taken on other catalog versions line up by
+        question id. Questions a snapshot predates read as not implemented.
+        """
+        if np is None:
+            raise RuntimeError("Assessment history requires NumPy (pip install numpy).")
+        catalog = catalog or self.catalog
+        snapshot_ids = list(snapshot_ids)
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT id, catalog_version, codes FROM snapshots "
+            f"WHERE id IN ({','.join('?' * len(snapshot_ids))})",
+            snapshot_ids,
+        ).fetchall() if snapshot_ids else []
+        # An id may be asked for more than once (e.g. diffing a snapshot
+        # with itself); every row it appears in gets filled
+        positions = {}
+        for row, snapshot_id in enumerate(snapshot_ids):
+            positions.setdefault(snapshot_id, []).append(row)
+        matrix = np.zeros((len(snapshot_ids), catalog.total_questions), dtype=np.int8)
+        by_version = {}
+        for snapshot_id, version, packed in rows:
+            entries = by_version.setdefault(version, [])
+            entries.extend((row, packed) for row in positions[snapshot_id])
+        for version, entries in by_version.items():
+            (question_ids,) = conn.execute(
+                "SELECT question_ids FROM snapshot_catalogs WHERE version = ?", (version,)
+            ).fetchone()
+            question_ids = json.loads(question_ids)
+            codes = unpack_code_matrix([packed for _, packed in entries], len(question_ids))
+            rows_at = np.array([row for row, _ in entries], dtype=np.intp)
+            if version == catalog.version:
+                matrix[rows_at] = codes
+                continue
+            index_of = catalog.index_of
+            targets = np.array([index_of.get(qid, -1) for qid in question_ids], dtype=np.intp)
+            kept = targets >= 0
+            matrix[rows_at[:, None], targets[kept]] = codes[:, kept]
+        return matrix
+
+
+answer_store = SQLiteAssessmentStore(
+    CATALOG, os.environ.get("ASSESSMENT_DB", "assessments.sqlite3")
+)
+
+
+@app.teardown_appcontext
+def _release_connections(exc):
+    for pool, conn in g.pop("_db_connections", {}).values():
+        pool.release(conn)
+
+
+def install_catalog(catalog, sections=None):
+    """Make `catalog` the active question catalog for the app and its store."""
+    global CATALOG, ISO_42001_SECTIONS
+    with _catalog_lock:
+        answer_store.set_catalog(catalog)
+        if sections is not None:
+            ISO_42001_SECTIONS = sections
+        CATALOG = catalog
+        for listener in _catalog_listeners:
+            listener(catalog)
+
+
+def reload_catalog(path=None):
+    """Load the catalog file and install it if its version changed.
+
+    Returns True if a new catalog was installed.
+    """
+    sections, version = load_catalog_data(path or app.config["CATALOG_PATH"])
+    if version == CATALOG.version:
+        return False
+    install_catalog(Catalog(sections, version), sections)
+    app.logger.info("Loaded question catalog version %s", version)
+    return True
+
+
+class CatalogWatcher:
+    """Polls the catalog file and hot-reloads it when it changes."""
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            signature = _file_signature(self.path)
+        except OSError:
+            signature = None
+        while True:
+            time.sleep(self.interval)
+            try:
+                current = _file_signature(self.path)
+                if current != signature:
+                    signature = current
+                    reload_catalog(self.path)
+            except Exception:
+                # A half-written or invalid file keeps the current catalog;
+                # the next successful read will pick up the fix.
+                app.logger.exception("Could not reload catalog from %s", self.path)
+
+
+catalog_watcher = CatalogWatcher(app.config["CATALOG_PATH"], app.config["CATALOG_RELOAD_INTERVAL"])
+
+
+@app.before_request
+def _start_catalog_watcher():
+    if app.config["CATALOG_RELOAD_INTERVAL"] > 0:
+        catalog_watcher.start()
+
+
+def load_codes():
+    """Load the current session's status-code vector, or None without a session."""
+    key = session.get('sid')
+    if key is None:
+        return None
+    with metrics.phase("session_load"):
+        return answer_store.load(key, current_catalog())
+
+
+def load_answers():
+    """Load the current session's answers as a {question_id: status} dict."""
+    codes = load_codes()
+    return {} if codes is None else current_catalog().decode_answers(codes)
+
+
+def load_gaps():
+    """Load the current session's gaps as (catalog index, code) pairs, or None."""
+    key = session.get('sid')
+    if key is None:
+        return None
+    with metrics.phase("session_load"):
+        return answer_store.load_gaps(key, current_catalog())
+
+
+def load_report(lazy=False, gaps=None):
+    """Build the current session's report from the incremental tallies.
+
+    Pass `gaps` if they were already loaded with load_gaps(). With
+    VERIFY_TALLIES enabled, the result is checked against a full
+    generate_report_data() recompute and the recompute wins on mismatch.
+    """
+    key = session.get('sid')
+    if key is None:
+        with metrics.phase("scoring"):
+            return generate_report_data({})
+    verify = app.config["VERIFY_TALLIES"]
+    catalog = current_catalog()
+    with metrics.phase("session_load"):
+        tally = answer_store.load_tally(key, catalog)
+        if gaps is None:
+            gaps = answer_store.load_gaps(key, catalog)
+    with metrics.phase("scoring"):
+        report_data = build_report(tally, gaps, catalog, lazy=lazy and not verify)
+    if verify:
+        full = generate_report_data(catalog.decode_answers(answer_store.load(key, catalog)))
+        if full != report_data:
+            app.logger.warning("Incremental report for assessment %s is out of date", key)
+            report_data = full
+    return report_data
+
+
+def save_section_answers(section, form):
+    """Write one section's answers from a submitted form."""
+    key = session.get('sid')
+    if key is None:
+        key = session['sid'] = answer_store.create(org=session.pop('org', ''))
+        codes = bytearray(section.stop - section.start)
+    else:
+        with metrics.phase("session_load"):
+            codes = answer_store.load(key, current_catalog())[section.start:section.stop]
+    for offset, q in enumerate(section.questions):
+        code = STATUS_CODES.get(form.get(q.id))
+        if code is not None:
+            codes[offset] = code
+    with metrics.phase("session_save"):
+        answer_store.save_section(key, section, codes)
+
+
+def save_answers(answers):
+    """Write individual {question_id: status} answers, e.g. from autosave.
+
+    Only sections with a changed answer are written. Returns the session's
+    ReportTally before and after the save and the changed question ids.
+    """
+    key = session.get('sid')
+    if key is None:
+        key = session['sid'] = answer_store.create(org=session.pop('org', ''))
+    catalog = current_catalog()
+    with metrics.phase("session_load"):
+        codes = answer_store.load(key, catalog)
+    before = ReportTally.from_codes(codes, catalog)
+    changed = []
+    sections = set()
+    for question_id, status in catalog.validate_answers(answers).items():
+        q = catalog.question(question_id)
+        code = STATUS_CODES[status]
+        if codes[q.index] != code:
+            codes[q.index] = code
+            changed.append(question_id)
+            sections.add(q.section_index)
+    with metrics.phase("session_save"):
+        for section_index in sorted(sections):
+            s = catalog.sections[section_index]
+            answer_store.save_section(key, s, codes[s.start:s.stop])
+    return before, ReportTally.from_codes(codes, catalog), changed
+
+
+def clear_session():
+    """End this session. The assessment and its answers are kept."""
+    session.clear()
+
+# --- FLASK ROUTES ---
+
+@app.route("/")
+def index():
+    """Display the welcome page."""
+    clear_session() # Start fresh
+    etag = make_etag("welcome")
+    return not_modified(etag) or cached_page(etag, lambda: templates.static_page("welcome"))
+
+@app.route("/start")
+def start():
+    """Start a new assessment and redirect to the first section.
+
+    The assessment is only stored once its first answers are saved, so
+    prefetches, crawlers and abandoned starts do not add empty assessments
+    to the portfolio rollups.
+    """
+    clear_session()
+    session['org'] = request.args.get('org', '')
+    metrics.inc("iso42001_assessments_started_total")
+    return redirect(url_for('section', section_index=0))
+
+@app.route("/section/<int:section_index>", methods=["GET", "POST"])
+def section(section_index):
+    """Display a section of the assessment."""
+
+    catalog = current_catalog()
+    total_sections = len(catalog.sections)
+
+    # Handle form submission
+    if request.method == "POST":
+        # Save this section's answers to the server-side store; only
+        # known question ids are kept, so 'action' is never stored
+        if 0 <= section_index < total_sections:
+            save_section_answers(catalog.sections[section_index], request.form)
+
+        action = request.form.get('action')
+        
+        if action == "next":
+            next_index = section_index + 1
+            if next_index < total_sections:
+                return redirect(url_for('section', section_index=next_index))
+        elif action == "prev":
+            prev_index = section_index - 1
+            if prev_index >= 0:
+                return redirect(url_for('section', section_index=prev_index))
+        elif action == "report":
+            metrics.inc("iso42001_assessments_completed_total")
+            if session.get('sid') is not None:
+                answer_store.take_snapshot(session['sid'])
+            return redirect(url_for('report'))
+
+    # Handle GET request
+    if 0 <= section_index < total_sections:
+        current_section = catalog.sections[section_index]
+        progress = ((section_index + 1) / total_sections) * 100
+        codes = load_codes()
+        section_codes = None
+        if codes is not None:
+            section_codes = bytes(codes[current_section.start:current_section.stop])
+
+        # ?fragment=1 returns only the section form, for in-page navigation
+        fragment = request.args.get('fragment') == '1'
+        etag = make_etag("section", section_index, section_codes, fragment)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        def render():
+            saved_answers = {} if codes is None else catalog.decode_answers(codes)
+            render_page = templates.render_fragment if fragment else templates.render
+            with metrics.phase("render"):
+                return render_page(
+                    "assessment",
+                    section=current_section,
+                    current_index=section_index,
+                    total_sections=total_sections,
+                    progress=progress,
+                    saved_answers=saved_answers
+                )
+        return cached_page(etag, render)
+    else:
+        # Invalid index, redirect to start
+        return redirect(url_for('index'))
+
+@app.route("/api/answers", methods=["POST"])
+def api_save_answers():
+    """Save individual answers and return the updated progress and score.
+
+    Expects {"answers": {question_id: status, ...}}; unknown ids and
+    statuses are reported back in "rejected" and not stored.
+    """
+    payload = request.get_json(silent=True)
+    answers = payload.get('answers') if isinstance(payload, dict) else None
+    if not isinstance(answers, dict):
+        return {"error": 'expected a JSON object like {"answers": {question_id: status}}'}, 400
+    before, after, changed = save_answers(answers)
+    metrics.inc("iso42001_answers_autosaved_total", len(changed))
+
+    catalog = current_catalog()
+    total = catalog.total_questions
+    score = compute_score(after.implemented_count, total)
+    section_updates = []
+    for i in sorted({catalog.question(question_id).section_index for question_id in changed}):
+        section_total = catalog.section_totals[i]
+        section_score = compute_score(after.section_implemented[i], section_total)
+        section_updates.append({
+            "index": i,
+            "fully_implemented": after.section_implemented[i],
+            "partially_implemented": after.section_partial[i],
+            "total": section_total,
+            "score": section_score,
+            "score_delta": section_score - compute_score(before.section_implemented[i], section_total),
+        })
+    return {
+        "changed": changed,
+        "rejected": sorted(set(answers) - set(catalog.validate_answers(answers))),
+        "progress": {
+            "fully_implemented": after.implemented_count,
+            "partially_implemented": after.partial_count,
+            "total": total,
+        },
+        "score": score,
+        "score_delta": score - compute_score(before.implemented_count, total),
+        "sections": section_updates,
+    }
+
+@app.route("/report")
+def report():
+    """Generate and display the final report.
+
+    In streaming mode (STREAM_REPORTS, or ?stream=1) the layout head and
+    summary card are sent first and the gap cards follow as they render.
+    """
+    stream = app.config["STREAM_REPORTS"] or request.args.get('stream') == '1'
+    gaps = load_gaps()
+    etag = make_etag("report", gaps)
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    metrics.inc("iso42001_reports_generated_total")
+
+    cached = render_cache.get(etag)
+    if cached is not None:
+        return cached_page(etag, lambda: cached)
+
+    report_data = load_report(lazy=stream, gaps=gaps)
+    context = dict(
+        score=report_data['score'],
+        implemented_count=report_data['implemented_count'],
+        total_questions=report_data['total_questions'],
+        summary_text=report_data['summary_text'],
+        gaps=report_data['gaps']
+    )
+
+    if stream:
+        chunks = templates.stream(["report_summary", "report_gaps"], **context)
+        response = Response(stream_with_context(chunks), mimetype="text/html")
+        response.set_etag(etag, weak=True)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    def render():
+        with metrics.phase("render"):
+            return templates.render("report", **context)
+    return cached_page(etag, render)
+
+@app.route("/reset")
+def reset():
+    """Clear session and redirect to the welcome page."""
+    clear_session()
+    return redirect(url_for('index'))
+
+@app.route("/dashboard")
+def dashboard():
+    """Show portfolio-wide compliance across every stored assessment.
+
+    Add ?format=json for the raw figures.
+    """
+    require_export_token()
+    data = build_dashboard(answer_store.status_counts())
+    if request.args.get('format') == 'json':
+        return data
+    return templates.render("dashboard", **data)
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    """Serve a fingerprinted static file built by build_css.py."""
+    found = assets.get(filename)
+    if found is None:
+        abort(404)
+    data, mimetype, etag = found
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(data, mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response
+
+@app.route("/api/search")
+def api_search():
+    """Search question text and recommendations.
+
+    ?q= is the query (the last word also matches as a prefix) and ?limit=
+    caps the results. ?gaps=1 limits results to the gaps in the current
+    session's report; ?assessment=<id> does the same for a stored
+    assessment and needs the export token.
+    """
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    # Gap positions must come from the catalog this index was built from
+    index = search_index
+    gaps = None
+    if request.args.get('assessment'):
+        require_export_token()
+        assessment_id = request.args.get('assessment', type=int)
+        if assessment_id is None:
+            abort(404)
+        gaps = answer_store.load_gaps(assessment_id, index.catalog)
+    elif request.args.get('gaps') == '1':
+        key = session.get('sid')
+        gaps = [] if key is None else answer_store.load_gaps(key, index.catalog)
+    within = None if gaps is None else dict(gaps)
+
+    with metrics.phase("search"):
+        matches = index.search(query, limit=limit, within=within)
+    results = []
+    for q, score, terms in matches:
+        result = {
+            "id": q.id,
+            "section": index.catalog.sections[q.section_index].title,
+            "score": score,
+            "text": highlight(q.text, terms),
+            "recommendation": highlight(q.recommendation, terms, SEARCH_SNIPPET_WIDTH),
+        }
+        if within is not None:
+            result["status"] = STATUSES[within[q.index]]
+        results.append(result)
+    return {
+        "query": query,
+        "results": results,
+        "completions": index.complete(query),
+    }
+
+@app.route("/history")
+def history():
+    """Score and gap trend across an assessment history, as JSON.
+
+    ?org= selects an organization's series and ?assessment= one
+    assessment's snapshots. The response has one point per snapshot and
+    the diff between the first and last.
+    """
+    require_export_token()
+    org = request.args.get('org')
+    assessment_id = request.args.get('assessment', type=int)
+    if not org and assessment_id is None:
+        return {"error": "pass ?org= or ?assessment="}, 400
+    series = load_history(org=org, assessment_id=assessment_id)
+    return {
+        "snapshots": series.trend(),
+        "diff": series.diff(0, -1) if len(series) > 1 else None,
+    }
+
+@app.route("/history/diff")
+def history_diff():
+    """Closed gaps, new gaps and score change between two snapshots, as JSON."""
+    require_export_token()
+    ids = [request.args.get('from', type=int), request.args.get('to', type=int)]
+    if None in ids:
+        return {"error": "pass ?from=<snapshot id>&to=<snapshot id>"}, 400
+    snapshots = {snapshot["id"]: snapshot for snapshot in answer_store.snapshots(ids=ids)}
+    if len(snapshots) != len(set(ids)):
+        abort(404)
+    ordered = [snapshots[snapshot_id] for snapshot_id in ids]
+    catalog = current_catalog()
+    series = SnapshotSeries(ordered, answer_store.load_snapshot_matrix(ids, catalog), catalog)
+    return series.diff(0, 1)
+
+@app.route("/assessments/<int:assessment_id>/snapshot", methods=["POST"])
+def snapshot_assessment(assessment_id):
+    """Record a stored assessment's current answers in its history."""
+    require_export_token()
+    snapshot_id = answer_store.take_snapshot(assessment_id)
+    if snapshot_id is None:
+        abort(404)
+    return {"snapshot_id": snapshot_id}
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Expose request timings and counters in Prometheus text format."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+# --- BULK EXPORT ---
+# Streams every stored assessment out as CSV, JSONL or one print-ready HTML
+# document. Assessments are read and scored a batch at a time, so memory
+# does not grow with the number of assessments.
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "html": "text/html",
+}
+
+EXPORT_CSV_COLUMNS = (
+    "assessment_id", "org", "created_at", "updated_at", "score",
+    "implemented_count", "total_questions", "gap_count",
+    "partially_implemented", "not_implemented", "summary_text",
+)
+
+
+
+def require_export_token():
+    """Abort with 403 unless the request carries EXPORT_TOKEN.
+
+    Guards the views that expose data across all assessments, and the
+    batch API.
+    """
+    token = app.config["EXPORT_TOKEN"]
+    supplied = request.headers.get("X-Export-Token") or request.args.get("token", "")
+    if not token or not secrets.compare_digest(supplied, token):
+        abort(403)
+
+
+def score_code_rows(code_rows):
+    """Score a batch of status-code vectors into generate_report_data() dicts."""
+    catalog = current_catalog()
+    if np is not None:
+        matrix = np.frombuffer(b"".join(code_rows), dtype=np.int8).reshape(
+            len(code_rows), catalog.total_questions
+        )
+        batch = BatchReport(matrix, catalog)
+        return [batch.report(i) for i in range(len(batch))]
+    return [generate_report_data(catalog.decode_answers(codes)) for codes in code_rows]
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def render_export_batch(fmt, batch):
+    """Render one batch from SQLiteAssessmentStore.iter_batches() as text."""
+    reports = score_code_rows([codes for _, codes in batch])
+    out = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(out)
+        for ((assessment_id, org, created_at, updated_at), _), data in zip(batch, reports):
+            partial = sum(1 for gap in data["gaps"] if gap["status"] == "partially_implemented")
+            writer.writerow((
+                assessment_id, org, _isoformat(created_at), _isoformat(updated_at),
+                data["score"], data["implemented_count"], data["total_questions"],
+                len(data["gaps"]), partial, len(data["gaps"]) - partial, data["summary_text"],
+            ))
+    elif fmt == "jsonl":
+        for ((assessment_id, org, created_at, updated_at), _), data in zip(batch, reports):
+            record = {
+                "assessment_id": assessment_id,
+                "org": org,
+                "created_at": _isoformat(created_at),
+                "updated_at": _isoformat(updated_at),
+            }
+            record.update(data)
+            out.write(json.dumps(record))
+            out.write("\n")
+    else:
+        for ((assessment_id, org, _, updated_at), _), data in zip(batch, reports):
+            out.write('<section class="report-export" style="break-after: page;">\n')
+            out.write(f'<p class="text-sm text-gray-500 mb-2">Assessment #{assessment_id}')
+            if org:
+                out.write(" &middot; " + str(escape(org)))
+            out.write(f" &middot; {_isoformat(updated_at)}</p>")
+            out.write(templates.render_fragment("report", **data))
+            out.write("\n</section>\n")
+    return out.getvalue()
+
+
+def _render_export_batch_worker(args):
+    fmt, batch = args
+    with app.test_request_context():
+        return render_export_batch(fmt, batch)
+
+
+def worker_context():
+    """Multiprocessing context for worker pools started by this process.
+
+    Pools are started from a multi-threaded server, so workers come from a
+    fork server (or are spawned) rather than forked; pass
+    _init_batch_worker as the initializer to hand them the active catalog.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def export_assessments(fmt, store=None, batch_size=500, processes=1, window=None):
+    """Yield an export of every stored assessment as text chunks.
+
+    With processes > 1, batches are scored and rendered in a process pool
+    while this process keeps reading from the database; output order is
+    preserved. At most `window` batches (default two per process) are read
+    ahead of the output. HTML needs an active request context for url_for().
+    """
+    if fmt not in EXPORT_MIMETYPES:
+        raise ValueError(f"Unknown export format: {fmt}")
+    store = store or answer_store
+    if fmt == "csv":
+        out = io.StringIO()
+        csv.writer(out).writerow(EXPORT_CSV_COLUMNS)
+        yield out.getvalue()
+    elif fmt == "html":
+        head, tail = templates.shell()
+        yield head.decode("utf-8")
+
+    batches = store.iter_batches(batch_size)
+    if processes > 1:
+        window = window or 2 * processes
+        pool = worker_context().Pool(
+            processes,
+            initializer=_init_batch_worker,
+            initargs=(ISO_42001_SECTIONS, current_catalog().version),
+        )
+        with pool:
+            in_flight = deque()
+            for batch in batches:
+                while len(in_flight) >= window:
+                    yield in_flight.popleft().get()
+                in_flight.append(pool.apply_async(_render_export_batch_worker, ((fmt, batch),)))
+            while in_flight:
+                yield in_flight.popleft().get()
+    else:
+        for batch in batches:
+            yield render_export_batch(fmt, batch)
+
+    if fmt == "html":
+        yield tail.decode("utf-8")
+
+
+@app.route("/export/<fmt>")
+def export(fmt):
+    """Stream a bulk export of all stored assessments."""
+    require_export_token()
+    if fmt not in EXPORT_MIMETYPES:
+        abort(404)
+    return Response(
+        stream_with_context(export_assessments(fmt)),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename=assessments.{fmt}"},
+    )
+
+
+@app.cli.command("export")
+@click.option("--format", "fmt", type=click.Choice(sorted(EXPORT_MIMETYPES)), default="csv")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True), default="-",
+              help="File to write to (default: stdout).")
+@click.option("--batch-size", type=int, default=500, show_default=True)
+@click.option("--processes", "-j", type=int, default=1, show_default=True,
+              help="Worker processes for scoring and rendering (0 = all cores).")
+def export_command(fmt, output, batch_size, processes):
+    """Export all stored assessments as CSV, JSONL or HTML."""
+    processes = processes or os.cpu_count() or 1
+    with app.test_request_context(), click.open_file(output, "w", encoding="utf-8") as out:
+        for chunk in export_assessments(fmt, batch_size=batch_size, processes=processes):
+            out.write(chunk)
+
+# --- BATCH API ---
+# Scores answer sets submitted by other systems, without storing them.
+# Items are validated and scored in a shared process pool a chunk at a
+# time. The pool's queue is bounded across all requests, so a large batch
+# is read from the client only as fast as the workers drain it, and the
+# pool is sized to leave cores free for interactive requests.
+
+BATCH_ITEM_FORMAT = 'expected {"id": ..., "answers": {question_id: status}}'
+
+
+class BatchScorer:
+    """Shared process pool with a bounded number of queued chunks.
+
+    submit() blocks while `max_pending` chunks are queued or running, and
+    `requests` limits how many batches are in progress at once. The pool
+    is started on first use, from a request thread, so its workers are
+    started by a fork server (or spawned) rather than forked from this
+    multi-threaded process; they are given the active catalog on start.
+    """
+
+    def __init__(self, processes, max_pending, max_requests):
+        self.processes = processes
+        self.requests = threading.BoundedSemaphore(max_requests)
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, args):
+        """Queue `func(args)` on the pool and return its AsyncResult."""
+        self._pending.acquire()
+        release = lambda _: self._pending.release()
+        try:
+            with self._lock:
+                if self._pool is None:
+                    catalog = current_catalog()
+                    self._pool = worker_context().Pool(
+                        self.processes,
+                        initializer=_init_batch_worker,
+                        initargs=(ISO_42001_SECTIONS, catalog.version),
+                    )
+                return self._pool.apply_async(
+                    func, (args,), callback=release, error_callback=release
+                )
+        except BaseException:
+            self._pending.release()
+            raise
+
+    def reset(self):
+        """Retire the pool; queued work still finishes, new work gets a new pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+
+batch_scorer = BatchScorer(
+    app.config["BATCH_PROCESSES"],
+    app.config["BATCH_MAX_PENDING"],
+    app.config["BATCH_MAX_CONCURRENT"],
+)
+
+
+@on_catalog_change
+def _reset_batch_scorer(catalog):
+    # Forked workers hold the catalog they started with
+    batch_scorer.reset()
+
+
+def check_batch_item(item):
+    """Validate one batch item against the catalog.
+
+    `item` is a {"id": ..., "answers": {question_id: status}} dict, or one
+    JSON line holding it. Returns (id, answers, error); `error` is None
+    when the item is valid.
+    """
+    if isinstance(item, (str, bytes)):
+        try:
+            item = json.loads(item)
+        except ValueError:
+            return None, None, {"error": "invalid JSON"}
+    if not isinstance(item, dict) or not isinstance(item.get("answers"), dict):
+        return None, None, {"error": BATCH_ITEM_FORMAT}
+    item_id = item.get("id")
+    answers = item["answers"]
+    index_of = current_catalog().index_of
+    unknown = sorted(key for key in answers if key not in index_of)
+    invalid = sorted(
+        key for key, value in answers.items()
+        if key in index_of and value not in STATUSES
+    )
+    if unknown or invalid:
+        error = {"error": "answers do not match the question catalog"}
+        if unknown:
+            error["unknown_questions"] = unknown
+        if invalid:
+            error["invalid_statuses"] = invalid
+        return item_id, None, error
+    return item_id, answers, None
+
+
+def score_batch_items(start, items, html=False):
+    """Validate and score a chunk of batch items into JSON lines.
+
+    Unanswered questions count as not implemented, as in
+    generate_report_data(). Returns (text, number of items scored).
+    """
+    records = []
+    scored = []
+    code_rows = []
+    for offset, item in enumerate(items):
+        item_id, answers, error = check_batch_item(item)
+        record = {"index": start + offset, "id": item_id}
+        if error is None:
+            scored.append(record)
+            code_rows.append(bytes(current_catalog().encode_answers(answers)))
+        else:
+            record.update(error)
+        records.append(record)
+    if code_rows:
+        for record, data in zip(scored, score_code_rows(code_rows)):
+            record.update(data)
+            if html:
+                record["html"] = templates.render_fragment("report", **data)
+    return "".join(json.dumps(record) + "\n" for record in records), len(scored)
+
+
+def _init_batch_worker(sections, version):
+    # A fresh worker loads the catalog file; use the parent's catalog instead
+    if CATALOG.version != version:
+        install_catalog(Catalog(sections, version), sections)
+
+
+def _score_batch_items_worker(args):
+    catalog_version, start, items, html = args
+    if CATALOG.version != catalog_version:
+        raise RuntimeError("the question catalog changed while the batch was running")
+    with app.test_request_context():
+        return score_batch_items(start, items, html)
+
+
+def _chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_batch_results(items, html=False, scorer=None, window=2):
+    """Yield JSONL results for an iterable of batch items, in input order.
+
+    Each chunk of BATCH_CHUNK_SIZE items is scored in the pool; at most
+    `window` chunks per batch are in flight, and input is only read as
+    results are handed back. Items past BATCH_MAX_ITEMS are not read.
+    """
+    scorer = scorer or batch_scorer
+    chunk_size = app.config["BATCH_CHUNK_SIZE"]
+    max_items = app.config["BATCH_MAX_ITEMS"]
+    version = current_catalog().version
+    in_flight = deque()
+
+    def collect():
+        start, count, result = in_flight.popleft()
+        try:
+            text, scored = result.get()
+        except Exception as exc:
+            app.logger.warning("Batch chunk at item %d failed: %s", start, exc)
+            return "".join(
+                json.dumps({"index": start + offset, "error": "scoring failed"}) + "\n"
+                for offset in range(count)
+            )
+        metrics.inc("iso42001_batch_assessments_scored_total", scored)
+        return text
+
+    items = iter(items)
+    start = 0
+    for chunk in _chunked(islice(items, max_items), chunk_size):
+        while len(in_flight) >= window:
+            yield collect()
+        job = (version, start, chunk, html)
+        in_flight.append((start, len(chunk), scorer.submit(_score_batch_items_worker, job)))
+        start += len(chunk)
+    while in_flight:
+        yield collect()
+    if next(items, None) is not None:
+        yield json.dumps({
+            "error": f"batch limit of {max_items} items reached; later items were not read"
+        }) + "\n"
+
+
+@app.route("/api/assessments/batch", methods=["POST"])
+def api_score_batch():
+    """Score a batch of answer sets and stream the reports back as JSONL.
+
+    The body is either JSON, {"assessments": [item, ...], "html": false}
+    or a bare list of items, or JSONL (application/x-ndjson) with one item
+    per line, which is read incrementally. Each item is
+    {"id": ..., "answers": {question_id: status}}. One result line is
+    written per item, in order; invalid items get an "error" line. Pass
+    "html": true or ?html=1 to include each rendered report.
+    """
+    require_export_token()
+    html = request.args.get('html') == '1'
+    if request.mimetype == "application/x-ndjson":
+        items = (line for line in request.stream if line.strip())
+    else:
+        payload = request.get_json(silent=True)
+        items = payload
+        if isinstance(payload, dict):
+            items = payload.get('assessments')
+            html = html or payload.get('html') is True
+        if not isinstance(items, list):
+            return {"error": 'expected {"assessments": [...]}, a JSON list, or JSONL'}, 400
+        if len(items) > app.config["BATCH_MAX_ITEMS"]:
+            return {"error": f"at most {app.config['BATCH_MAX_ITEMS']} items per batch"}, 413
+
+    if not batch_scorer.requests.acquire(blocking=False):
+        return {"error": "too many batches in progress; retry later"}, 503, {"Retry-After": "5"}
+    response = Response(
+        stream_with_context(stream_batch_results(items, html=html)),
+        mimetype="application/x-ndjson",
+        headers={"X-Catalog-Version": current_catalog().version},
+    )
+    response.call_on_close(batch_scorer.requests.release)
+    return response
 
 # --- RUN THE APP ---
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+"""Load test and micro-benchmarks for the assessment flow.
+
+Drives the real Flask app through its test client. Each simulated user
+runs a full journey (/start, then GET + POST of every /section/<n>, then
+/report). The catalog can be scaled up from ISO_42001_SECTIONS to see how
+the app behaves with larger question sets.
+
+Usage:
+    python bench.py --users 200 --concurrency 8 --scale 10
+    python bench.py --save-baseline baseline.json
+    python bench.py --compare baseline.json --tolerance 15
+"""
+import argparse
+import atexit
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The app opens its database at import time, so point it at a scratch file
+# before importing it.
+_scratch = tempfile.mkdtemp(prefix="iso42001-bench-")
+atexit.register(shutil.rmtree, _scratch, ignore_errors=True)
+os.environ.setdefault("ASSESSMENT_DB", os.path.join(_scratch, "bench.sqlite3"))
+
+import app as assessment_app  # noqa: E402
+
+
+def scaled_sections(factor):
+    """Repeat every section of ISO_42001_SECTIONS `factor` times with unique ids."""
+    if factor <= 1:
+        return assessment_app.ISO_42001_SECTIONS
+    sections = []
+    for copy in range(factor):
+        for raw in assessment_app.ISO_42001_SECTIONS:
+            sections.append({
+                "title": f"{raw['title']} ({copy + 1})",
+                "description": raw["description"],
+                "questions": [
+                    dict(q, id=f"{q['id']}_{copy + 1}") for q in raw["questions"]
+                ],
+            })
+    return sections
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def route_name(path):
+    return re.sub(r"/\d+", "/<n>", path.split("?", 1)[0])
+
+
+def run_journey(seed, report_query=""):
+    """Run one user journey and return [(route, seconds, cookie bytes)]."""
+    rng = random.Random(seed)
+    client = assessment_app.app.test_client()
+    catalog = assessment_app.CATALOG
+    samples = []
+
+    def timed(method, path, **kwargs):
+        start = time.perf_counter()
+        response = getattr(client, method)(path, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        cookie = max((len(c) for c in response.headers.getlist("Set-Cookie")), default=0)
+        samples.append((f"{method.upper()} {route_name(path)}", elapsed, cookie))
+        return response
+
+    timed("get", "/start")
+    last = len(catalog.sections) - 1
+    for section in catalog.sections:
+        path = f"/section/{section.index}"
+        timed("get", path)
+        form = {q.id: rng.choice(assessment_app.STATUSES) for q in section.questions}
+        form["action"] = "report" if section.index == last else "next"
+        timed("post", path, data=form)
+    timed("get", "/report" + report_query)
+    return samples
+
+
+def load_test(users, concurrency, report_query=""):
+    """Run `users` journeys on `concurrency` threads."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        journeys = list(pool.map(lambda seed: run_journey(seed, report_query), range(users)))
+    wall = time.perf_counter() - start
+
+    by_route = {}
+    cookie_max = 0
+    for samples in journeys:
+        for route, elapsed, cookie in samples:
+            by_route.setdefault(route, []).append(elapsed)
+            cookie_max = max(cookie_max, cookie)
+
+    routes = {}
+    total_requests = 0
+    for route, values in sorted(by_route.items()):
+        values.sort()
+        total_requests += len(values)
+        routes[route] = {
+            "count": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+        }
+    return {
+        "routes": routes,
+        "requests": total_requests,
+        "wall_s": wall,
+        "throughput_rps": total_requests / wall if wall else 0.0,
+        "journeys_per_s": users / wall if wall else 0.0,
+        "max_cookie_bytes": cookie_max,
+    }
+
+
+def time_call(func, iterations):
+    """Median wall time of `func()` in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return percentile(timings, 50) * 1000
+
+
+def micro_benchmarks(iterations, batch_size):
+    """Time scoring and template rendering on their own."""
+    app_ = assessment_app
+    catalog = app_.CATALOG
+    rng = random.Random(0)
+    answers = {q.id: rng.choice(app_.STATUSES) for q in catalog.questions}
+    report_data = app_.generate_report_data(answers)
+    section = catalog.sections[0]
+    results = {
+        "score_generate_report_data_ms": time_call(
+            lambda: app_.generate_report_data(answers), iterations),
+        "score_incremental_ms": time_call(
+            lambda: app_.build_report(
+                app_.ReportTally.from_codes(catalog.encode_answers(answers)),
+                [(i, c) for i, c in enumerate(catalog.encode_answers(answers)) if c != 2],
+            ), iterations),
+    }
+    if app_.np is not None:
+        batch = [
+            {q.id: rng.choice(app_.STATUSES) for q in catalog.questions}
+            for _ in range(batch_size)
+        ]
+        results[f"score_batch_{batch_size}_ms"] = time_call(
+            lambda: app_.score_batch(batch), max(1, iterations // 10))
+
+    with app_.app.test_request_context():
+        results["render_assessment_ms"] = time_call(
+            lambda: app_.templates.render(
+                "assessment", section=section, current_index=0,
+                total_sections=len(catalog.sections), progress=0, saved_answers=answers,
+            ), iterations)
+        results["render_report_ms"] = time_call(
+            lambda: app_.templates.render("report", **report_data), iterations)
+        results["render_report_stream_ms"] = time_call(
+            lambda: b"".join(app_.templates.stream(
+                ["report_summary", "report_gaps"], **report_data)), iterations)
+    return results
+
+
+def compare(current, baseline, tolerance):
+    """Return lines describing metrics that got worse by more than `tolerance` %."""
+    regressions = []
+
+    def check(name, now, before, higher_is_better=False):
+        if not before:
+            return
+        change = (now - before) / before * 100
+        worse = -change if higher_is_better else change
+        if worse > tolerance:
+            regressions.append(f"{name}: {before:.3f} -> {now:.3f} ({change:+.1f}%)")
+
+    for route, stats in current["load"]["routes"].items():
+        old = baseline["load"]["routes"].get(route)
+        if old:
+            for key in ("p50_ms", "p95_ms", "p99_ms"):
+                check(f"{route} {key}", stats[key], old[key])
+    check("throughput_rps", current["load"]["throughput_rps"],
+          baseline["load"]["throughput_rps"], higher_is_better=True)
+    check("max_cookie_bytes", current["load"]["max_cookie_bytes"],
+          baseline["load"]["max_cookie_bytes"])
+    for key, value in current["micro"].items():
+        if key in baseline["micro"]:
+            check(key, value, baseline["micro"][key])
+    return regressions
+
+
+def print_results(results):
+    load = results["load"]
+    print(f"catalog: {results['questions']} questions in {results['sections']} sections")
+    print(f"{'route':<24}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in load["routes"].items():
+        print(f"{route:<24}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+    print(f"throughput: {load['throughput_rps']:.1f} req/s, "
+          f"{load['journeys_per_s']:.1f} journeys/s")
+    print(f"max session cookie: {load['max_cookie_bytes']} bytes")
+    for key, value in results["micro"].items():
+        print(f"{key:<36}{value:>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="journeys to simulate")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent users")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="repeat the catalog sections this many times")
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="iterations per micro-benchmark")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="assessments per score_batch() call")
+    parser.add_argument("--stream", action="store_true", help="request streamed reports")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE", help="baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0,
+                        help="allowed regression in percent (default: 10)")
+    args = parser.parse_args(argv)
+
+    assessment_app.install_catalog(assessment_app.Catalog(scaled_sections(args.scale)))
+    catalog = assessment_app.CATALOG
+
+    results = {
+        "questions": catalog.total_questions,
+        "sections": len(catalog.sections),
+        "load": load_test(args.users, args.concurrency, "?stream=1" if args.stream else ""),
+        "micro": micro_benchmarks(args.iterations, args.batch_size),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance}%:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,476 @@
+"""Build the self-hosted stylesheet for the app's templates.
+
+Scans the class attributes of the page templates in app.py and generates
+only the Tailwind (v3) utilities they use, on top of a trimmed copy of
+Tailwind's preflight reset. This replaces the Tailwind CDN script, which
+compiled styles in the browser on every page load.
+
+Output goes to static/: a fingerprinted app.<hash>.css plus manifest.json,
+which maps logical asset names to fingerprinted files and is what the app
+reads to build asset URLs. The Inter font files in static/fonts/ (committed,
+or refreshed with --download-fonts) are fingerprinted and referenced from
+the stylesheet; without them pages fall back to the system sans-serif font.
+
+Usage:
+    python build_css.py
+    python build_css.py --download-fonts
+    python build_css.py --check      # exit 1 if static/ is out of date
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(HERE, "static")
+FONT_DIR = os.path.join(STATIC_DIR, "fonts")
+MANIFEST = os.path.join(STATIC_DIR, "manifest.json")
+
+FONT_WEIGHTS = (400, 500, 600, 700)
+FONT_FILE = "inter-latin-{weight}.woff2"
+GOOGLE_FONTS_CSS = (
+    "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap"
+)
+
+# --- Tailwind v3 theme values used by the generator ---
+
+SPACING = {
+    "0": "0px", "px": "1px", "0.5": "0.125rem", "1": "0.25rem", "1.5": "0.375rem",
+    "2": "0.5rem", "2.5": "0.625rem", "3": "0.75rem", "3.5": "0.875rem", "4": "1rem",
+    "5": "1.25rem", "6": "1.5rem", "7": "1.75rem", "8": "2rem", "9": "2.25rem",
+    "10": "2.5rem", "11": "2.75rem", "12": "3rem", "14": "3.5rem", "16": "4rem",
+    "20": "5rem", "24": "6rem", "32": "8rem",
+}
+FRACTIONS = {"1/2": "50%", "1/3": "33.333333%", "2/3": "66.666667%", "1/4": "25%",
+             "3/4": "75%", "full": "100%"}
+
+COLORS = {
+    "white": "#fff", "black": "#000", "transparent": "transparent",
+    "gray": {"50": "#f9fafb", "100": "#f3f4f6", "200": "#e5e7eb", "300": "#d1d5db",
+             "400": "#9ca3af", "500": "#6b7280", "600": "#4b5563", "700": "#374151",
+             "800": "#1f2937", "900": "#111827"},
+    "blue": {"50": "#eff6ff", "100": "#dbeafe", "200": "#bfdbfe", "300": "#93c5fd",
+             "400": "#60a5fa", "500": "#3b82f6", "600": "#2563eb", "700": "#1d4ed8",
+             "800": "#1e40af", "900": "#1e3a8a"},
+    "green": {"50": "#f0fdf4", "100": "#dcfce7", "200": "#bbf7d0", "300": "#86efac",
+              "400": "#4ade80", "500": "#22c55e", "600": "#16a34a", "700": "#15803d",
+              "800": "#166534", "900": "#14532d"},
+    "red": {"50": "#fef2f2", "100": "#fee2e2", "200": "#fecaca", "300": "#fca5a5",
+            "400": "#f87171", "500": "#ef4444", "600": "#dc2626", "700": "#b91c1c",
+            "800": "#991b1b", "900": "#7f1d1d"},
+    "yellow": {"50": "#fefce8", "100": "#fef9c3", "200": "#fef08a", "300": "#fde047",
+               "400": "#facc15", "500": "#eab308", "600": "#ca8a04", "700": "#a16207",
+               "800": "#854d0e", "900": "#713f12"},
+}
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"),
+}
+
+SCREENS = {"sm": "640px", "md": "768px", "lg": "1024px", "xl": "1280px", "2xl": "1536px"}
+
+TRANSITION_TIMING = "cubic-bezier(0.4, 0, 0.2, 1)"
+
+# Utilities that do not follow a scale: class -> (sort group, declarations)
+STATIC_UTILITIES = {
+    "absolute": (10, "position: absolute"),
+    "relative": (10, "position: relative"),
+    "block": (30, "display: block"),
+    "inline-block": (30, "display: inline-block"),
+    "flex": (30, "display: flex"),
+    "hidden": (30, "display: none"),
+    "min-h-screen": (41, "min-height: 100vh"),
+    "max-w-4xl": (42, "max-width: 56rem"),
+    "max-w-full": (42, "max-width: 100%"),
+    "items-start": (60, "align-items: flex-start"),
+    "items-center": (60, "align-items: center"),
+    "justify-between": (61, "justify-content: space-between"),
+    "justify-center": (61, "justify-content: center"),
+    "rounded-md": (70, "border-radius: 0.375rem"),
+    "rounded-lg": (70, "border-radius: 0.5rem"),
+    "rounded-full": (70, "border-radius: 9999px"),
+    "border": (71, "border-width: 1px"),
+    "border-0": (71, "border-width: 0px"),
+    "border-t": (72, "border-top-width: 1px"),
+    "border-b": (72, "border-bottom-width: 1px"),
+    "text-left": (90, "text-align: left"),
+    "text-center": (90, "text-align: center"),
+    "text-right": (90, "text-align: right"),
+    "font-medium": (92, "font-weight: 500"),
+    "font-semibold": (92, "font-weight: 600"),
+    "font-bold": (92, "font-weight: 700"),
+    "shadow-sm": (95, "--tw-shadow: 0 1px 2px 0 rgb(0 0 0 / 0.05); "
+                      "box-shadow: var(--tw-shadow)"),
+    "shadow-md": (95, "--tw-shadow: 0 4px 6px -1px rgb(0 0 0 / 0.1), "
+                      "0 2px 4px -2px rgb(0 0 0 / 0.1); box-shadow: var(--tw-shadow)"),
+    "shadow-lg": (95, "--tw-shadow: 0 10px 15px -3px rgb(0 0 0 / 0.1), "
+                      "0 4px 6px -4px rgb(0 0 0 / 0.1); box-shadow: var(--tw-shadow)"),
+    "outline-none": (96, "outline: 2px solid transparent; outline-offset: 2px"),
+    "transition": (98, "transition-property: color, background-color, border-color, "
+                       "text-decoration-color, fill, stroke, opacity, box-shadow, transform, "
+                       "filter, backdrop-filter; "
+                       f"transition-timing-function: {TRANSITION_TIMING}; "
+                       "transition-duration: 150ms"),
+    "transition-all": (98, "transition-property: all; "
+                           f"transition-timing-function: {TRANSITION_TIMING}; "
+                           "transition-duration: 150ms"),
+}
+
+SPACING_PROPERTIES = {
+    "m": ("margin",), "mx": ("margin-left", "margin-right"),
+    "my": ("margin-top", "margin-bottom"), "mt": ("margin-top",), "mr": ("margin-right",),
+    "mb": ("margin-bottom",), "ml": ("margin-left",),
+    "p": ("padding",), "px": ("padding-left", "padding-right"),
+    "py": ("padding-top", "padding-bottom"), "pt": ("padding-top",),
+    "pr": ("padding-right",), "pb": ("padding-bottom",), "pl": ("padding-left",),
+}
+# Tailwind emits shorthand before axis before side, so the more specific wins
+SPACING_ORDER = ("m", "mx", "my", "mt", "mr", "mb", "ml", "p", "px", "py", "pt", "pr", "pb", "pl")
+
+PREFLIGHT = """\
+*, ::before, ::after {
+  box-sizing: border-box;
+  border-width: 0;
+  border-style: solid;
+  border-color: #e5e7eb;
+  --tw-translate-x: 0;
+  --tw-translate-y: 0;
+  --tw-ring-color: rgb(59 130 246 / 0.5);
+  --tw-shadow: 0 0 #0000;
+}
+html {
+  line-height: 1.5;
+  -webkit-text-size-adjust: 100%;
+  tab-size: 4;
+  font-family: ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji";
+}
+body { margin: 0; line-height: inherit; }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+b, strong { font-weight: bolder; }
+button, input, optgroup, select, textarea {
+  font-family: inherit;
+  font-size: 100%;
+  font-weight: inherit;
+  line-height: inherit;
+  color: inherit;
+  margin: 0;
+  padding: 0;
+}
+button, select { text-transform: none; }
+button, [type='button'], [type='reset'], [type='submit'] {
+  -webkit-appearance: button;
+  background-color: transparent;
+  background-image: none;
+}
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre { margin: 0; }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle; }
+button, [role="button"] { cursor: pointer; }
+[hidden] { display: none; }
+"""
+
+# Classes styled by the layout's own <style> block (print rules), not utilities
+LAYOUT_CLASSES = {"assessment-container", "report-card"}
+
+CLASS_ATTRIBUTE = re.compile(r'\bclass="([^"]*)"')
+
+
+def collect_classes(sources):
+    """Return the set of class names used in class="..." attributes."""
+    classes = set()
+    for source in sources:
+        for match in CLASS_ATTRIBUTE.finditer(source):
+            # Jinja expressions inside the attribute are not class names
+            value = re.sub(r"{[{%].*?[}%]}", " ", match.group(1))
+            classes.update(value.split())
+    return classes
+
+
+def _color(name):
+    family, _, shade = name.partition("-")
+    value = COLORS.get(family)
+    if isinstance(value, dict):
+        return value.get(shade)
+    return value if not shade else None
+
+
+def _utility(name):
+    """Return (sort key, declarations) for a bare utility, or None if unknown."""
+    if name in STATIC_UTILITIES:
+        group, declarations = STATIC_UTILITIES[name]
+        return (group, 0), declarations
+
+    negative = name.startswith("-")
+    bare = name[1:] if negative else name
+    sign = "-" if negative else ""
+
+    match = re.fullmatch(r"(m|mx|my|mt|mr|mb|ml|p|px|py|pt|pr|pb|pl)-(.+)", bare)
+    if match:
+        prefix, size = match.groups()
+        value = "auto" if size == "auto" and prefix[0] == "m" else SPACING.get(size)
+        if value is None or (negative and prefix[0] == "p"):
+            return None
+        if negative and value != "auto":
+            value = f"-{value}"
+        group = 20 if prefix[0] == "m" else 80
+        return (group, SPACING_ORDER.index(prefix)), "; ".join(
+            f"{prop}: {value}" for prop in SPACING_PROPERTIES[prefix]
+        )
+
+    match = re.fullmatch(r"(top|right|bottom|left)-(.+)", bare)
+    if match:
+        side, size = match.groups()
+        value = FRACTIONS.get(size) or SPACING.get(size)
+        if value is None:
+            return None
+        return (11, 0), f"{side}: {sign}{value}"
+
+    match = re.fullmatch(r"(w|h)-(.+)", name)
+    if match:
+        axis, size = match.groups()
+        value = FRACTIONS.get(size) or SPACING.get(size)
+        if value is None:
+            return None
+        return (40 if axis == "h" else 43, 0), f"{'width' if axis == 'w' else 'height'}: {value}"
+
+    match = re.fullmatch(r"translate-(x|y)-(.+)", bare)
+    if match:
+        axis, size = match.groups()
+        value = FRACTIONS.get(size) or SPACING.get(size)
+        if value is None:
+            return None
+        return (50, 0), (
+            f"--tw-translate-{axis}: {sign}{value}; "
+            "transform: translate(var(--tw-translate-x), var(--tw-translate-y))"
+        )
+
+    match = re.fullmatch(r"text-(.+)", name)
+    if match and match.group(1) in FONT_SIZES:
+        size, line_height = FONT_SIZES[match.group(1)]
+        return (91, 0), f"font-size: {size}; line-height: {line_height}"
+
+    match = re.fullmatch(r"(bg|text|border|ring)-(.+)", name)
+    if match:
+        kind, color_name = match.groups()
+        color = _color(color_name)
+        if color is None:
+            return None
+        prop, group = {
+            "bg": ("background-color", 75),
+            "text": ("color", 93),
+            "border": ("border-color", 73),
+            "ring": ("--tw-ring-color", 97),
+        }[kind]
+        return (group, 0), f"{prop}: {color}"
+
+    match = re.fullmatch(r"duration-(\d+)", name)
+    if match:
+        return (99, 0), f"transition-duration: {match.group(1)}ms"
+
+    return None
+
+
+def _escape(name):
+    return re.sub(r"([^a-zA-Z0-9_-])", r"\\\1", name)
+
+
+def _rule(name):
+    """Return (sort key, media query or None, CSS rule) for a class, or None."""
+    *variants, utility = name.split(":")
+    media = None
+    pseudo = ""
+    variant_rank = 0
+    for variant in variants:
+        if variant in SCREENS:
+            media = f"(min-width: {SCREENS[variant]})"
+            variant_rank = 10 + list(SCREENS).index(variant)
+        elif variant in ("hover", "focus"):
+            pseudo += f":{variant}"
+            variant_rank = max(variant_rank, 1 if variant == "hover" else 2)
+        else:
+            return None
+
+    if utility == "container" and not variants:
+        rules = ["  .container { width: 100%; }"]
+        for screen, width in SCREENS.items():
+            rules.append(f"  @media (min-width: {width}) {{ .container {{ max-width: {width}; }} }}")
+        return (0, (0, 0), name), None, "\n".join(rule.strip() for rule in rules)
+
+    match = re.fullmatch(r"(-?)space-(x|y)-(.+)", utility)
+    if match:
+        negative, axis, size = match.groups()
+        value = SPACING.get(size)
+        if value is None:
+            return None
+        side = "left" if axis == "x" else "top"
+        selector = f".{_escape(name)}{pseudo} > :not([hidden]) ~ :not([hidden])"
+        return (variant_rank, (65, 0), name), media, (
+            f"{selector} {{ margin-{side}: {negative}{value}; }}"
+        )
+
+    found = _utility(utility)
+    if found is None:
+        return None
+    key, declarations = found
+    return (variant_rank, key, name), media, (
+        f".{_escape(name)}{pseudo} {{ {declarations}; }}"
+    )
+
+
+def font_faces(font_urls):
+    """@font-face rules for the Inter files that are available."""
+    rules = []
+    for weight in FONT_WEIGHTS:
+        url = font_urls.get(weight)
+        if url is None:
+            continue
+        rules.append(
+            "@font-face {\n"
+            "  font-family: 'Inter';\n"
+            "  font-style: normal;\n"
+            f"  font-weight: {weight};\n"
+            "  font-display: swap;\n"
+            f"  src: local('Inter'), url('{url}') format('woff2');\n"
+            "}"
+        )
+    return "\n".join(rules)
+
+
+def compile_css(classes, font_urls=None):
+    """Return (css, unknown classes) for a set of class names."""
+    rules = []
+    unknown = []
+    for name in classes - LAYOUT_CLASSES:
+        rule = _rule(name)
+        if rule is None:
+            unknown.append(name)
+        else:
+            rules.append(rule)
+    rules.sort(key=lambda rule: rule[0])
+
+    parts = ["/* Generated by build_css.py; do not edit by hand. */"]
+    faces = font_faces(font_urls or {})
+    if faces:
+        parts.append(faces)
+    parts.append(PREFLIGHT.rstrip())
+    parts.extend(css for _, media, css in rules if media is None)
+    for width in SCREENS.values():
+        query = f"(min-width: {width})"
+        scoped = [css for _, media, css in rules if media == query]
+        if scoped:
+            parts.append(f"@media {query} {{\n  " + "\n  ".join(scoped) + "\n}")
+    return "\n".join(parts) + "\n", sorted(unknown)
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def download_fonts():
+    """Fetch Inter (latin subset) woff2 files from Google Fonts into static/fonts/."""
+    os.makedirs(FONT_DIR, exist_ok=True)
+    request = urllib.request.Request(GOOGLE_FONTS_CSS, headers={
+        # A modern browser user agent makes Google Fonts serve woff2
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    })
+    with urllib.request.urlopen(request, timeout=30) as response:
+        css = response.read().decode("utf-8")
+    # Each block is preceded by a /* subset */ comment; keep the latin ones
+    for subset, block in re.findall(r"/\* ([\w-]+) \*/\s*(@font-face\s*{[^}]*})", css):
+        if subset != "latin":
+            continue
+        weight = int(re.search(r"font-weight:\s*(\d+)", block).group(1))
+        url = re.search(r"url\((https://[^)]+)\)", block).group(1)
+        with urllib.request.urlopen(url, timeout=30) as response:
+            data = response.read()
+        with open(os.path.join(FONT_DIR, FONT_FILE.format(weight=weight)), "wb") as f:
+            f.write(data)
+        print(f"downloaded Inter {weight}")
+
+
+def build(write=True):
+    """Generate the stylesheet and manifest. Returns (manifest, unknown classes)."""
+    # Imported here so --help works without Flask installed
+    import app
+
+    sources = [
+        app.layout_template, app.welcome_template, app.assessment_template,
+        app.report_template, app.dashboard_template,
+    ]
+    manifest = {}
+    outputs = {}
+    font_urls = {}
+    for weight in FONT_WEIGHTS:
+        name = FONT_FILE.format(weight=weight)
+        path = os.path.join(FONT_DIR, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        hashed = f"fonts/inter-latin-{weight}.{fingerprint(data)}.woff2"
+        manifest[f"fonts/{name}"] = hashed
+        outputs[hashed] = data
+        # The stylesheet sits in static/, next to the fonts directory
+        font_urls[weight] = hashed
+
+    css, unknown = compile_css(collect_classes(sources), font_urls)
+    data = css.encode("utf-8")
+    hashed = f"app.{fingerprint(data)}.css"
+    manifest["app.css"] = hashed
+    outputs[hashed] = data
+
+    if write:
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        for name, data in outputs.items():
+            with open(os.path.join(STATIC_DIR, name), "wb") as f:
+                f.write(data)
+        # Remove stale fingerprinted builds
+        for entry in os.listdir(STATIC_DIR):
+            if re.fullmatch(r"app\.[0-9a-f]{10}\.css", entry) and entry not in outputs:
+                os.remove(os.path.join(STATIC_DIR, entry))
+        with open(MANIFEST, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return manifest, unknown
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--download-fonts", action="store_true",
+                        help="fetch Inter from Google Fonts into static/fonts/ first")
+    parser.add_argument("--check", action="store_true",
+                        help="do not write; exit 1 if static/manifest.json is out of date")
+    args = parser.parse_args(argv)
+
+    if args.download_fonts:
+        download_fonts()
+
+    manifest, unknown = build(write=not args.check)
+    for name in unknown:
+        print(f"warning: no CSS generated for class '{name}'", file=sys.stderr)
+
+    if args.check:
+        try:
+            with open(MANIFEST) as f:
+                current = json.load(f)
+        except OSError:
+            current = None
+        if current != manifest:
+            print("static/ is out of date; run python build_css.py", file=sys.stderr)
+            return 1
+        print("static/ is up to date")
+        return 0
+
+    for name, hashed in sorted(manifest.items()):
+        print(f"{name} -> static/{hashed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
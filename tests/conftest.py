@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing app opens the default store; keep it out of the working tree.
+os.environ.setdefault("ASSESSMENT_DB", os.path.join(tempfile.mkdtemp(), "import.sqlite3"))
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """A fresh assessment store per test, installed as app.answer_store.
+
+    The catalog active before the test is reinstalled afterwards, and the
+    render caches are emptied on both sides so no test sees another's pages.
+    """
+    catalog, sections = app_module.CATALOG, app_module.ISO_42001_SECTIONS
+    fresh = app_module.SQLiteAssessmentStore(catalog, str(tmp_path / "test.sqlite3"))
+    monkeypatch.setattr(app_module, "answer_store", fresh)
+    app_module.render_cache.clear()
+    app_module.compressed_cache.clear()
+    yield fresh
+    app_module.install_catalog(catalog, sections)
+    app_module.render_cache.clear()
+    app_module.compressed_cache.clear()
+    fresh.pool.close_all()
+
+
+@pytest.fixture
+def client():
+    app_module.app.config["TESTING"] = True
+    return app_module.app.test_client()
@@ -0,0 +1,72 @@
+import gzip
+
+import pytest
+
+import app
+
+
+def get(client, path, **headers):
+    response = client.get(path, headers=headers)
+    body = response.get_data()
+    response.close()
+    return response, body
+
+
+def decompress(body, encoding):
+    if encoding == "br":
+        return app.brotli.decompress(body)
+    return gzip.decompress(body)
+
+
+def answer_first_question(client, status):
+    question = app.CATALOG.questions[0]
+    response = client.post("/api/answers", json={"answers": {question.id: status}})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/report", "/report?stream=1", "/section/0"])
+def test_same_answers_are_not_modified(client, path):
+    answer_first_question(client, "fully_implemented")
+    first, _ = get(client, path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    again, body = get(client, path, **{"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert body == b""
+
+
+def test_changed_answer_changes_etag(client):
+    answer_first_question(client, "fully_implemented")
+    before, _ = get(client, "/report")
+    answer_first_question(client, "partially_implemented")
+    after, _ = get(client, "/report", **{"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_catalog_reload_changes_etag(client):
+    answer_first_question(client, "fully_implemented")
+    before, _ = get(client, "/report")
+    sections = app.ISO_42001_SECTIONS
+    app.install_catalog(app.Catalog(sections, "test-reloaded"), sections)
+    after, _ = get(client, "/report", **{"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+@pytest.mark.parametrize("path", ["/report", "/report?stream=1"])
+def test_responses_are_compressed(client, path, encoding):
+    if encoding not in app.COMPRESSION_ENCODINGS:
+        pytest.skip(f"{encoding} support is not installed")
+    answer_first_question(client, "partially_implemented")
+    plain, plain_body = get(client, path, **{"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+
+    for _ in range(2):  # second time from the compressed cache, if not streamed
+        response, body = get(client, path, **{"Accept-Encoding": encoding})
+        assert response.headers["Content-Encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert decompress(body, encoding) == plain_body
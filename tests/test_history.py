@@ -0,0 +1,18 @@
+import pytest
+
+import app
+
+pytest.importorskip("numpy")
+
+
+def test_diff_of_a_snapshot_with_itself_is_empty(store):
+    assessment_id = store.create(org="history-test")
+    for section in app.CATALOG.sections:
+        store.save_section(assessment_id, section, bytes([app.FULLY_IMPLEMENTED]) * len(section.questions))
+    snapshot_id = store.take_snapshot(assessment_id)
+
+    matrix = store.load_snapshot_matrix([snapshot_id, snapshot_id])
+    series = app.SnapshotSeries(store.snapshots(ids=[snapshot_id]) * 2, matrix)
+    diff = series.diff(0, 1)
+    assert diff["score_before"] == diff["score_after"] == 100
+    assert diff["closed_gaps"] == diff["new_gaps"] == []
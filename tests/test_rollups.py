@@ -0,0 +1,44 @@
+import random
+
+import app
+
+
+def grouped_counts(store):
+    rows = store.pool.connection().execute(
+        "SELECT question_id, status, COUNT(*) FROM answers GROUP BY question_id, status"
+    )
+    return {(question_id, status): count for question_id, status, count in rows}
+
+
+def rollup_counts(store):
+    rows = store.pool.connection().execute(
+        "SELECT question_id, status, count FROM question_status_counts WHERE count != 0"
+    )
+    return {(question_id, status): count for question_id, status, count in rows}
+
+
+def assert_rollups_match(store):
+    expected = grouped_counts(store)
+    assert rollup_counts(store) == expected
+    catalog = store.catalog
+    counts = store.status_counts()
+    for q in catalog.questions:
+        for status in range(len(app.STATUSES)):
+            assert counts[q.index][status] == expected.get((q.id, status), 0)
+
+
+def test_rollups_match_answers_after_creates_saves_and_deletes(store):
+    rng = random.Random(12)
+    catalog = store.catalog
+    assessments = []
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.2 or not assessments:
+            assessments.append(store.create(org=rng.choice(("", "a", "b"))))
+        elif action < 0.85:
+            section = rng.choice(catalog.sections)
+            codes = bytes(rng.randrange(len(app.STATUSES)) for _ in section.questions)
+            store.save_section(rng.choice(assessments), section, codes)
+        else:
+            store.delete(assessments.pop(rng.randrange(len(assessments))))
+        assert_rollups_match(store)
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+import app
+
+pytest.importorskip("numpy")
+
+
+def random_answer_sets(count, seed=0):
+    rng = random.Random(seed)
+    answer_sets = []
+    for _ in range(count):
+        answers = {}
+        for q in app.CATALOG.questions:
+            if rng.random() < 0.9:
+                answers[q.id] = rng.choice(app.STATUSES)
+        if rng.random() < 0.2:
+            answers["NOT_A_QUESTION"] = "fully_implemented"
+        answer_sets.append(answers)
+    # Edge cases: nothing answered, everything implemented
+    answer_sets.append({})
+    answer_sets.append({q.id: "fully_implemented" for q in app.CATALOG.questions})
+    return answer_sets
+
+
+def test_score_batch_matches_generate_report_data():
+    answer_sets = random_answer_sets(200)
+    batch = app.score_batch(answer_sets)
+    for row, answers in enumerate(answer_sets):
+        assert batch.report(row) == app.generate_report_data(answers)
+
+
+def test_score_batch_rejects_invalid_status():
+    answers = {app.CATALOG.questions[0].id: "bogus"}
+    with pytest.raises(ValueError):
+        app.score_batch([answers])
+    assert app.score_batch([app.CATALOG.validate_answers(answers)]).report(0) == \
+        app.generate_report_data({})
@@ -0,0 +1,9 @@
+import app
+
+
+def test_complete_keeps_text_whose_length_changes_when_lowercased():
+    assert app.search_index.complete("İİ bia") == ["İİ bias"]
+
+
+def test_highlight_marks_words_after_text_whose_length_changes_when_lowercased():
+    assert app.highlight("İİ risk", {"risk"}) == "İİ <mark>risk</mark>"
@@ -0,0 +1,73 @@
+import copy
+import random
+
+import app
+
+
+def session_id(client):
+    with client.session_transaction() as sess:
+        return sess.get("sid")
+
+
+def assert_tally_matches_recompute(store, key):
+    catalog = app.CATALOG
+    incremental = app.build_report(store.load_tally(key, catalog), store.load_gaps(key, catalog), catalog)
+    full = app.generate_report_data(catalog.decode_answers(store.load(key, catalog)))
+    assert incremental == full
+
+
+def random_edits(client, store, rng, steps):
+    catalog = app.CATALOG
+    for _ in range(steps):
+        if rng.random() < 0.5:
+            section = rng.choice(catalog.sections)
+            form = {
+                q.id: rng.choice(app.STATUSES)
+                for q in section.questions if rng.random() < 0.7
+            }
+            form["action"] = "next"
+            response = client.post(f"/section/{section.index}", data=form)
+            response.close()
+            assert response.status_code in (200, 302)
+        else:
+            answers = {
+                q.id: rng.choice(app.STATUSES)
+                for q in rng.sample(catalog.questions, rng.randint(1, 5))
+            }
+            response = client.post("/api/answers", json={"answers": answers})
+            assert response.status_code == 200
+            key = session_id(client)
+            full = app.generate_report_data(catalog.decode_answers(store.load(key, catalog)))
+            assert response.get_json()["score"] == full["score"]
+        assert_tally_matches_recompute(store, session_id(client))
+
+
+def reshuffled_catalog(rng):
+    """The current catalog with a question dropped, one added and sections reordered."""
+    sections = copy.deepcopy(app.ISO_42001_SECTIONS)
+    sections[0]["questions"].pop(rng.randrange(len(sections[0]["questions"])))
+    sections[-1]["questions"].append({
+        "id": "TEST_NEW_QUESTION",
+        "text": "Is this question new?",
+        "recommendation": "Answer the new question.",
+    })
+    rng.shuffle(sections)
+    return app.Catalog(sections, "test-reshuffled"), sections
+
+
+def test_tallies_match_full_recompute(client, store):
+    rng = random.Random(6)
+    for _ in range(3):
+        client.get("/reset")
+        random_edits(client, store, rng, 40)
+
+
+def test_tallies_match_full_recompute_after_catalog_reload(client, store):
+    rng = random.Random(7)
+    random_edits(client, store, rng, 20)
+    key = session_id(client)
+
+    catalog, sections = reshuffled_catalog(rng)
+    app.install_catalog(catalog, sections)
+    assert_tally_matches_recompute(store, key)
+    random_edits(client, store, rng, 40)